@@ -43,6 +43,98 @@ def _title_artist_keys(title: str, artist: Optional[str]) -> Tuple[str, Optional
     a = _normalize(artist) if artist else None
     return t, a
 
+class KBIndex:
+    """
+    Einmal normalisierter KB-Index: exakte Treffer per Dict, Fuzzy über die
+    vorberechneten Keys (keine Re-Normalisierung pro Query).
+    """
+
+    def __init__(
+        self,
+        entries: List[Dict[str, Any]],
+        title_key: str = "title",
+        artist_key: str = "artist"
+    ):
+        self._reset(entries)
+        for e in entries:
+            et = _normalize(str(e.get(title_key, "")))
+            ea_raw = e.get(artist_key)
+            ea = _normalize(str(ea_raw)) if ea_raw else None
+            self._add(e, et, ea)
+
+    def _reset(self, entries: List[Dict[str, Any]]) -> None:
+        self.entries = entries
+        self.norm: List[Tuple[str, Optional[str]]] = []
+        self.by_ta: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.by_t: Dict[str, Dict[str, Any]] = {}
+
+    def _add(self, e: Dict[str, Any], et: str, ea: Optional[str]) -> None:
+        self.norm.append((et, ea))
+        # setdefault: bei Duplikaten gewinnt (wie bisher) der erste Eintrag
+        if ea:
+            self.by_ta.setdefault((et, ea), e)
+        self.by_t.setdefault(et, e)
+
+    @classmethod
+    def from_keys(cls, entries: List[Dict[str, Any]], keys: List[List[Any]]) -> "KBIndex":
+        """Baut den Index aus gespeicherten Keys (to_keys) neu auf, ohne erneut zu normalisieren."""
+        if len(keys) != len(entries):
+            raise ValueError("Index-Cache passt nicht zu den KB-Einträgen")
+        idx = cls.__new__(cls)
+        idx._reset(entries)
+        for e, (et, ea) in zip(entries, keys):
+            idx._add(e, str(et), str(ea) if ea else None)
+        return idx
+
+    def to_keys(self) -> List[List[Any]]:
+        """Normalisierte [title, artist] pro Eintrag, in KB-Reihenfolge."""
+        return [[et, ea] for et, ea in self.norm]
+
+    def best_match(self, target_title: str, target_artist: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Heuristik:
+        1) exakter Normalized-Match (title+artist)
+        2) exakter Normalized-Match (nur title)
+        3) fuzzy (title+artist)
+        4) fuzzy (nur title)
+        """
+        t_norm, a_norm = _title_artist_keys(target_title, target_artist)
+
+        # 1) exact title+artist
+        if a_norm:
+            e = self.by_ta.get((t_norm, a_norm))
+            if e is not None:
+                return e
+
+        # 2) exact title
+        e = self.by_t.get(t_norm)
+        if e is not None:
+            return e
+
+        # 3) fuzzy title+artist
+        best = None
+        best_score = 0.0
+        for e, (et, ea) in zip(self.entries, self.norm):
+            title_score = SequenceMatcher(a=t_norm, b=et).ratio()
+            artist_score = SequenceMatcher(a=a_norm or "", b=ea or "").ratio()
+            score = (title_score * 0.8) + (artist_score * 0.2)
+            if score > best_score:
+                best, best_score = e, score
+        if best and best_score >= 0.86:
+            return best
+
+        # 4) fuzzy title only
+        best = None
+        best_score = 0.0
+        for e, (et, _) in zip(self.entries, self.norm):
+            score = SequenceMatcher(a=t_norm, b=et).ratio()
+            if score > best_score:
+                best, best_score = e, score
+        if best and best_score >= 0.92:
+            return best
+
+        return None
+
 def _best_match(
     target_title: str,
     target_artist: Optional[str],
@@ -50,59 +142,8 @@ def _best_match(
     title_key: str = "title",
     artist_key: str = "artist"
 ) -> Optional[Dict[str, Any]]:
-    """
-    Heuristik:
-    1) exakter Normalized-Match (title+artist)
-    2) exakter Normalized-Match (nur title)
-    3) fuzzy (title+artist)
-    4) fuzzy (nur title)
-    """
-    t_norm, a_norm = _title_artist_keys(target_title, target_artist)
-
-    # Vorindex: Normalisierte Keys
-    def norm_entry(e: Dict[str, Any]) -> Tuple[str, Optional[str]]:
-        et = _normalize(str(e.get(title_key, "")))
-        ea_raw = e.get(artist_key)
-        ea = _normalize(str(ea_raw)) if ea_raw else None
-        return et, ea
-
-    # 1) exact title+artist
-    for e in entries:
-        et, ea = norm_entry(e)
-        if et == t_norm and ea and a_norm and ea == a_norm:
-            return e
-
-    # 2) exact title
-    for e in entries:
-        et, _ = norm_entry(e)
-        if et == t_norm:
-            return e
-
-    # 3) fuzzy title+artist
-    best = None
-    best_score = 0.0
-    for e in entries:
-        et, ea = norm_entry(e)
-        title_score = SequenceMatcher(a=t_norm, b=et).ratio()
-        artist_score = SequenceMatcher(a=a_norm or "", b=ea or "").ratio()
-        score = (title_score * 0.8) + (artist_score * 0.2)
-        if score > best_score:
-            best, best_score = e, score
-    if best and best_score >= 0.86:
-        return best
-
-    # 4) fuzzy title only
-    best = None
-    best_score = 0.0
-    for e in entries:
-        et, _ = norm_entry(e)
-        score = SequenceMatcher(a=t_norm, b=et).ratio()
-        if score > best_score:
-            best, best_score = e, score
-    if best and best_score >= 0.92:
-        return best
-
-    return None
+    """Einzel-Lookup ohne Cache; für wiederholte Abfragen KBIndex direkt nutzen."""
+    return KBIndex(entries, title_key, artist_key).best_match(target_title, target_artist)
 
 def load_songs_kb(path: str | Path) -> List[Dict[str, Any]]:
     p = Path(path)
@@ -117,13 +158,69 @@ def load_songs_kb(path: str | Path) -> List[Dict[str, Any]]:
         return data
     raise ValueError("songs_kb.json hat ein unerwartetes Format")
 
+# Index-Cache pro KB-Datei: (Pfad) -> ((mtime_ns, size), KBIndex); neu gebaut nur wenn die Datei sich ändert
+_INDEX_CACHE: Dict[Path, Tuple[Tuple[int, int], KBIndex]] = {}
+INDEX_DISK_VERSION = 2  # v2: nur JSON-Keys (v1 war ein Pickle)
+
+def _index_disk_path(p: Path) -> Path:
+    # Mini-Cache neben der KB: songs_kb.json -> songs_kb.json.idx (JSON, kein Pickle)
+    return p.with_name(p.name + ".idx")
+
+def _load_index_from_disk(p: Path, stamp: Tuple[int, int], entries: List[Dict[str, Any]]) -> Optional[KBIndex]:
+    try:
+        with _index_disk_path(p).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None  # fehlt, alter Pickle-Cache oder kaputt -> neu bauen
+    if not isinstance(data, dict) or data.get("version") != INDEX_DISK_VERSION:
+        return None
+    if tuple(data.get("src_stamp") or ()) != stamp:
+        return None
+    try:
+        return KBIndex.from_keys(entries, data.get("keys") or [])
+    except (TypeError, ValueError):
+        return None
+
+def _save_index_to_disk(p: Path, stamp: Tuple[int, int], idx: KBIndex) -> None:
+    out = _index_disk_path(p)
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_DISK_VERSION, "src_stamp": list(stamp), "keys": idx.to_keys()},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(out)
+    except OSError:
+        pass  # Cache ist optional (z.B. read-only Ordner)
+
+def load_kb_index(path: str | Path) -> KBIndex:
+    """
+    KBIndex für eine KB-Datei: erst RAM-Cache, dann die normalisierten Keys aus
+    der .idx neben der JSON (gültig solange mtime+Größe der JSON passen), sonst
+    neu normalisieren. Die KB selbst wird immer frisch geparst.
+    """
+    p = Path(path).resolve()
+    try:
+        st = p.stat()
+    except OSError:
+        raise FileNotFoundError(f"songs_kb not found: {p}") from None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _INDEX_CACHE.get(p)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    entries = load_songs_kb(p)
+    idx = _load_index_from_disk(p, stamp, entries)
+    if idx is None:
+        idx = KBIndex(entries)
+        _save_index_to_disk(p, stamp, idx)
+    _INDEX_CACHE[p] = (stamp, idx)
+    return idx
+
 def genres_for_track(
     title: str,
     artist: Optional[str],
     kb_path: str | Path = "songs_kb.json"
 ) -> Optional[List[str]]:
-    entries = load_songs_kb(kb_path)
-    match = _best_match(title, artist, entries)
+    match = load_kb_index(kb_path).best_match(title, artist)
     if not match:
         return None
 
@@ -50,6 +50,7 @@ import tempfile
 import shutil
 import importlib.util
 from pathlib import Path
+from unittest.mock import patch, MagicMock
 
 
 # =============================================================================
@@ -871,6 +872,183 @@ class TestFileStructure(unittest.TestCase):
             self.skipTest(f"Overlays not found: {missing_overlays}")
 
 
+# =============================================================================
+# Test: KB writes (threaded server)
+# =============================================================================
+
+def _load_webserver():
+    """Import webserver.py from BASE_DIR (None if it cannot be imported here)."""
+    try:
+        spec = importlib.util.spec_from_file_location("webserver", BASE_DIR / "webserver.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    except Exception as e:
+        print(f"⚠️ webserver.py could not be imported: {e}")
+        return None
+
+
+class TestKBWriteConcurrency(unittest.TestCase):
+    """
+    Tests that enrich saves, DB builds and artist-not-sure actions do not lose
+    each other's changes to songs_kb.json, and that enrich runs do not overlap.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.ws = _load_webserver()
+    
+    def setUp(self):
+        if self.ws is None:
+            self.skipTest("webserver.py could not be imported")
+        self.test_dir = Path(tempfile.mkdtemp()).resolve()
+        self.kb_path = self.test_dir / "songs_kb.json"
+        self.kb_path.write_text(json.dumps([
+            {"title": "Song A", "artist": "Artist A", "tags": ["pop"], "notes": ""},
+            {"title": "Song B", "artist": "Artist B", "tags": ["rock"], "notes": ""},
+        ]), encoding="utf-8")
+        self.queue_path = self.test_dir / "artist_not_sure.jsonl"
+        self.reviewed_path = self.test_dir / "artist_not_sure.reviewed.jsonl"
+        self.queue_path.write_text("", encoding="utf-8")
+        
+        self.patches = [
+            patch.object(self.ws, "ENRICH_SAFE_ROOT", self.test_dir),
+            patch.object(self.ws, "ENRICH_KB_PATH", self.kb_path),
+            patch.object(self.ws, "ENRICH_BACKUPS_DIR", self.test_dir / "backups"),
+        ]
+        for p in self.patches:
+            p.start()
+        self.ws._ans_kb_cache.update(path=None, stamp=None, data=None, dirty_gen=0, written_gen=0)
+    
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _read_kb(self):
+        data = json.loads(self.kb_path.read_text(encoding="utf-8"))
+        songs = data["songs"] if isinstance(data, dict) else data
+        return {e["title"]: e for e in songs}
+    
+    def _new_entry(self, title, artist):
+        entry = {"title": title, "artist": artist, "tags": ["edm"]}
+        return entry, "track-id", self.ws._enrich_norm_key(title, artist)
+    
+    def test_ans_action_during_enrich_run_is_kept(self):
+        """Test: Notes written by an ANS action while enrich runs survive the enrich save."""
+        ws = self.ws
+        # Enrich run starts: snapshot of the KB, then minutes of Spotify calls...
+        _, _, kb_index = ws._load_kb_with_index()
+        key_b = ws._enrich_norm_key("Song B", "Artist B")
+        ws._update_existing_entry(kb_index[key_b], {"indie"}, "Song B", "Album B")
+        
+        # ...meanwhile the panel confirms an artist alias and rewrites the KB
+        ok = ws.process_artist_not_sure_action(
+            "confirm", "Song A", "Artist X", "Song A", "Artist A",
+            self.kb_path, self.queue_path, self.reviewed_path
+        )
+        self.assertTrue(ok)
+        notes_after_ans = self._read_kb()["Song A"]["notes"]
+        self.assertIn("artist x", notes_after_ans)
+        
+        # Enrich run saves its results
+        ok, _ = ws._save_enriched_kb(
+            [self._new_entry("Song C", "Artist C")], {key_b: kb_index[key_b]}, 1, 1, 0
+        )
+        self.assertTrue(ok)
+        
+        kb = self._read_kb()
+        self.assertEqual(kb["Song A"]["notes"], notes_after_ans)
+        self.assertIn("Song C", kb)
+        self.assertEqual(kb["Song B"]["tags"], ["indie", "rock"])
+        self.assertEqual(kb["Song B"]["album"], "Album B")
+        self.assertIsNone(ws._ans_kb_cache["data"])
+    
+    def test_unwritten_ans_edit_and_enrich_save_interleave(self):
+        """Test: An ANS edit still waiting for kb_write_lock and an enrich save both land."""
+        ws = self.ws
+        # ANS action edits the cached KB in memory...
+        with ws.artist_not_sure_lock:
+            kb_data, kb_entries = ws._load_kb_for_action(self.kb_path)
+            entry = ws._find_kb_entry(kb_entries, "Song A", "Artist A")
+            entry["notes"] = '{"artist_aliases": ["Artist X"]}'
+            ws._ans_kb_cache["dirty_gen"] += 1
+            gen = ws._ans_kb_cache["dirty_gen"]
+        
+        # ...the enrich save gets kb_write_lock first...
+        ok, _ = ws._save_enriched_kb([self._new_entry("Song C", "Artist C")], {}, 1, 0, 0)
+        self.assertTrue(ok)
+        kb = self._read_kb()
+        self.assertIn("Artist X", kb["Song A"]["notes"])
+        self.assertIn("Song C", kb)
+        
+        # ...then the ANS writer persists its snapshot
+        self.assertTrue(ws._write_kb_data(self.kb_path, kb_data, gen))
+        kb = self._read_kb()
+        self.assertIn("Artist X", kb["Song A"]["notes"])
+        self.assertIn("Song C", kb)
+    
+    def test_unwritten_ans_edit_and_db_build_interleave(self):
+        """Test: A DB build keeps pending ANS edits, and the late ANS write keeps the build."""
+        ws = self.ws
+        with ws.artist_not_sure_lock:
+            kb_data, kb_entries = ws._load_kb_for_action(self.kb_path)
+            entry = ws._find_kb_entry(kb_entries, "Song A", "Artist A")
+            entry["notes"] = '{"artist_aliases": ["Artist X"]}'
+            ws._ans_kb_cache["dirty_gen"] += 1
+            gen = ws._ans_kb_cache["dirty_gen"]
+        
+        # /run/build_db runs before the ANS writer gets kb_write_lock
+        tracks = [ws.Track(title="Song D", artist="Artist D", album="Album D")]
+        with patch.object(ws, "SONGS_KB_PATH", self.kb_path), \
+             patch.object(ws, "read_input_csvs", return_value=tracks):
+            ws.execute_build_spotify_db()
+        kb = self._read_kb()
+        self.assertIn("Artist X", kb["Song A"]["notes"])
+        self.assertIn("song d", kb)  # build_db_norm lowercases
+        self.assertIsNone(ws._ans_kb_cache["data"])
+        
+        # The stale-looking ANS write must not undo the build
+        self.assertTrue(ws._write_kb_data(self.kb_path, kb_data, gen))
+        kb = self._read_kb()
+        self.assertIn("Artist X", kb["Song A"]["notes"])
+        self.assertIn("song d", kb)
+    
+    def test_db_build_keeps_wrapped_kb_format(self):
+        """Test: The DB builder merges into a {"songs": [...]} KB without dropping the wrapper."""
+        ws = self.ws
+        self.kb_path.write_text(json.dumps({"songs": [
+            {"title": "Song A", "artist": "Artist A", "tags": ["pop"], "notes": "keep"},
+        ]}), encoding="utf-8")
+        tracks = [ws.Track(title="Song A", artist="Artist A", album="Album A"),
+                  ws.Track(title="Song D", artist="Artist D")]
+        with patch.object(ws, "SONGS_KB_PATH", self.kb_path), \
+             patch.object(ws, "read_input_csvs", return_value=tracks):
+            ws.execute_build_spotify_db()
+        data = json.loads(self.kb_path.read_text(encoding="utf-8"))
+        self.assertIsInstance(data, dict)
+        kb = self._read_kb()
+        self.assertEqual(kb["Song A"]["notes"], "keep")
+        self.assertEqual(kb["Song A"]["album"], "album a")
+        self.assertIn("song d", kb)
+    
+    def test_enrich_missing_refuses_overlapping_run(self):
+        """Test: A second /run/enrich_missing while one runs answers 409 without starting."""
+        ws = self.ws
+        handler = MagicMock()
+        with patch.object(ws, "run_spotify_enrich_missing") as run:
+            with ws.enrich_run_lock:
+                ws._handle_enrich_missing(handler)
+            run.assert_not_called()
+            handler.send_response.assert_called_with(409)
+            
+            run.return_value = (True, "done")
+            ws._handle_enrich_missing(handler)
+            run.assert_called_once()
+            handler.send_response.assert_called_with(200)
+        self.assertFalse(ws.enrich_run_lock.locked())
+
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
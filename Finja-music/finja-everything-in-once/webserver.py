@@ -64,7 +64,6 @@
 
 
 import http.server
-import socketserver
 import os
 import json
 import subprocess
@@ -78,29 +77,62 @@ import ctypes
 import csv
 import re
 import secrets
+import socket
+import gzip
+import io
+import email.utils
+import queue
 import tempfile
 import shutil
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from difflib import SequenceMatcher
 import pickle
-from typing import Any, List, Dict, Tuple, Optional, Callable
+from typing import Any, List, Dict, Tuple, Optional, Callable, KeysView
 import signal
 
+# Single-instance lock: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
 # ==============================================================================
 # Third-Party Imports
 # ==============================================================================
 # For TruckersFM API integration
 import requests
 from bs4 import BeautifulSoup
+import urllib3
 
 # For Spotify enrichment
-import urllib.request
 import urllib.parse
-import urllib.error
 import urllib
 
+# Optional: orjson for faster JSON parse/serialize (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: Aho-Corasick multi-pattern matching for enrichment tagging
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Fallback: plain substring scan
+
+# Optional: Brotli for static panel assets (gzip is always available)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 # ==============================================================================
 # Configuration & Constants
 # ==============================================================================
@@ -119,6 +151,10 @@ CONFIG_DIR = SCRIPT_DIR / "config"
 MEMORY_DIR = SCRIPT_DIR / "Memory"
 CACHE_DIR = SCRIPT_DIR / "cache"
 SONGS_KB_FILENAME = "songs_kb.json"
+SONGS_KB_PATH = SONGSDB_DIR / SONGS_KB_FILENAME
+MISSINGSONGS_DIR = SCRIPT_DIR / "missingsongs"
+ARTIST_NOT_SURE_QUEUE_PATH = MISSINGSONGS_DIR / "artist_not_sure.jsonl"
+ARTIST_NOT_SURE_REVIEWED_PATH = MISSINGSONGS_DIR / "artist_not_sure.reviewed.jsonl"
 MULTI_SPACE_PATTERN = r"\s{2,}"  # NOSONAR
 UTC_OFFSET = "+00:00"
 GAME_STATE_FILE = "Memory/game_state.txt"
@@ -136,7 +172,38 @@ writer_stop_event = threading.Event()
 active_nowplaying_thread: Optional[threading.Thread] = None
 nowplaying_stop_event = threading.Event()
 
+# The HTTP server handles requests in parallel threads: serialize source
+# switching, and guard the in-memory KB / queue file of the artist-not-sure panel
+source_switch_lock = threading.Lock()
+artist_not_sure_lock = threading.Lock()
+
+# Serializes full songs_kb.json rewrites (artist-not-sure actions coalesce theirs;
+# the enrich save merges into the current KB under it)
+kb_write_lock = threading.Lock()
+
+# One /run/enrich_missing at a time (taken non-blocking; a second request is refused)
+enrich_run_lock = threading.Lock()
+
+# Bounded worker pool for artist-not-sure KB rewrites (keeps handler threads free)
+artist_not_sure_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ans")
+ARTIST_NOT_SURE_TIMEOUT_S = 30
+ARTIST_NOT_SURE_ACTIONS = frozenset({"confirm", "deny", "allow_title_only"})
+POST_MAX_BODY_BYTES = 64 * 1024  # real payload is four short strings
+POST_READ_CHUNK = 8192
+JSONL_WRITE_BUFFER = 1024 * 1024  # queue rewrites go out in one large write
+
+# Reviewed artist-not-sure entries are appended by one background writer,
+# one write() + fsync() per batch collected within REVIEWED_FLUSH_WINDOW_S
+REVIEWED_FLUSH_WINDOW_S = 0.1
+_reviewed_queue: "queue.Queue[Tuple[Path, Dict[str, Any]]]" = queue.Queue()
+_reviewed_writer: Optional[threading.Thread] = None
+_reviewed_writer_guard = threading.Lock()
+
 MANUAL_SLEEP_MODE = None
+SLEEP_COMMAND_MODES = frozenset({"sleep", "wake", "auto"})
+
+# Open descriptor holding the single-instance lock (released by the OS on exit)
+lock_fd: Optional[int] = None
 
 # ==============================================================================
 # SECTION 1: Database Building Logic
@@ -398,26 +465,18 @@ def execute_build_spotify_db() -> None:
     and saves updated database atomically.
     
     Process:
-    1. Load existing knowledge base
-    2. Read all CSV files from exports directory
+    1. Read all CSV files from exports directory
+    2. Load the current knowledge base (under kb_write_lock, including
+       artist-not-sure edits that are not written yet)
     3. Merge new tracks with existing entries
-    4. Save updated database
+    4. Save updated database and reset the panel's KB cache
     """
     print("[DB Builder] Process started...")
     
     try:
-        kb_path = SONGSDB_DIR / SONGS_KB_FILENAME
+        kb_path = SONGS_KB_PATH
         
-        # Load existing KB
-        if kb_path.exists():
-            with kb_path.open("r", encoding="utf-8") as f:
-                existing_kb = json.load(f)
-        else:
-            existing_kb = []
-            
-        print(f"[DB Builder] Loaded {len(existing_kb)} existing entries.")
-        
-        # Read new tracks from CSV files
+        # Read new tracks from CSV files (before taking the KB locks)
         tracks = read_input_csvs([str(EXPORTS_DIR / "*.csv")])
         
         if not tracks:
@@ -426,31 +485,55 @@ def execute_build_spotify_db() -> None:
             
         print(f"[DB Builder] Read {len(tracks)} tracks from CSV files.")
         
-        # Build index map for fast lookup
-        kb_index_map = {kb_key_of(e): e for e in existing_kb}
-        
-        # Merge new tracks
-        for tr in tracks:
-            new_entry = track_to_entry(tr)
-            key = kb_key_of(new_entry)
+        with kb_write_lock, artist_not_sure_lock:
+            # Load existing KB
+            doc = _pending_ans_kb_doc(kb_path)
+            if doc is None:
+                if kb_path.exists():
+                    with kb_path.open("r", encoding="utf-8") as f:
+                        doc = json.load(f)
+                else:
+                    doc = []
+            existing_kb = doc["songs"] if isinstance(doc, dict) else doc
+            if not isinstance(existing_kb, list):
+                raise ValueError("unexpected KB format")
+                
+            print(f"[DB Builder] Loaded {len(existing_kb)} existing entries.")
+            
+            # Build index map for fast lookup
+            kb_index_map = {kb_key_of(e): e for e in existing_kb}
+            
+            # Merge new tracks
+            for tr in tracks:
+                new_entry = track_to_entry(tr)
+                key = kb_key_of(new_entry)
+                
+                if key in kb_index_map:
+                    kb_index_map[key] = merge_entry(kb_index_map[key], new_entry)
+                else:
+                    kb_index_map[key] = new_entry
+            
+            # Sort by artist, then title
+            merged_list = sorted(
+                kb_index_map.values(),
+                key=lambda e: (e.get("artist", "").lower(), e.get("title", "").lower())
+            )
             
-            if key in kb_index_map:
-                kb_index_map[key] = merge_entry(kb_index_map[key], new_entry)
+            # Keep the {"songs": [...]} wrapper; pending panel writers hold `doc`
+            # itself, so a rewrite from them still contains the merged list
+            if isinstance(doc, dict):
+                doc["songs"] = merged_list
             else:
-                kb_index_map[key] = new_entry
-        
-        # Sort by artist, then title
-        merged_list = sorted(
-            kb_index_map.values(),
-            key=lambda e: (e.get("artist", "").lower(), e.get("title", "").lower())
-        )
-        
-        # Save atomically
-        build_db_atomic_write_text(
-            kb_path,
-            json.dumps(merged_list, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
+                doc = merged_list
+            
+            # Save atomically
+            build_db_atomic_write_text(
+                kb_path,
+                json.dumps(doc, ensure_ascii=False, indent=2),
+                encoding="utf-8"
+            )
+            
+            _ans_kb_cache.update(path=None, stamp=None, data=None, dirty_gen=0, written_gen=0)
         
         print(f"[DB Builder] Success! Database updated to {len(merged_list)} entries.")
         print(f"[DB Builder] Saved to: {kb_path}")
@@ -490,8 +573,7 @@ def _handle_sleep_command(handler, mode: str) -> None:
     """Handle /cmd/{mode} (sleep/wake/auto)."""
     global MANUAL_SLEEP_MODE
     
-    valid_modes = ["sleep", "wake", "auto"]
-    if mode not in valid_modes:
+    if mode not in SLEEP_COMMAND_MODES:
         _send_json_response(handler, 400, False, f"Invalid mode: {mode}")
         return
 
@@ -563,6 +645,40 @@ def is_finja_sleeping() -> bool:
         
     return False
 
+def _json_loads(data: str | bytes) -> Any:
+    """
+    Parse JSON from str or bytes (orjson if installed).
+    
+    Both backends raise a json.JSONDecodeError subclass on invalid input.
+    
+    Args:
+        data: JSON document
+        
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """
+    Serialize object to UTF-8 JSON bytes (orjson if installed).
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+        
+    Returns:
+        UTF-8 encoded JSON (non-ASCII kept as-is)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
 def atomic_write_safe(target: Path, text: str) -> None:
     """
     Atomically write text to file using temporary file.
@@ -1491,14 +1607,80 @@ def _send_json_response(handler, status_code: int, success: bool, message: str,
         message: Response message
         **extra: Additional fields for response
     """
+    response = {"success": success, "message": message}
+    response.update(extra)
+    
+    _send_json_bytes(handler, status_code, _json_dumps(response, indent=False))
+
+
+def _send_json_bytes(handler, status_code: int, body: bytes) -> None:
+    """
+    Send an already encoded JSON body with Content-Length.
+    
+    Args:
+        handler: HTTP request handler
+        status_code: HTTP status code
+        body: UTF-8 encoded JSON
+    """
     handler.send_response(status_code)
     handler.send_header('Content-type', CONTENT_TYPE_JSON)
+    handler.send_header('Content-Length', str(len(body)))
+    if getattr(handler, 'close_connection', False):
+        handler.send_header('Connection', 'close')
     handler.end_headers()
+    handler.wfile.write(body)
+
+
+# Fixed error replies, encoded once
+_RESP_INVALID_JSON = _json_dumps({"success": False, "message": "Invalid JSON"}, indent=False)
+_RESP_MISSING_PARAMS = _json_dumps({"success": False, "message": "Missing parameters"}, indent=False)
+_RESP_BAD_LENGTH = _json_dumps(
+    {"success": False, "message": "Missing or invalid Content-Length"}, indent=False
+)
+_RESP_TOO_LARGE = _json_dumps({"success": False, "message": "Payload too large"}, indent=False)
+_RESP_INCOMPLETE_BODY = _json_dumps({"success": False, "message": "Incomplete request body"}, indent=False)
+
+
+def _read_post_body(handler) -> Optional[bytes]:
+    """
+    Read a POST body of bounded size in fixed-size chunks.
     
-    response = {"success": success, "message": message}
-    response.update(extra)
+    Sends the error response itself when the length is missing, invalid,
+    above POST_MAX_BODY_BYTES or the client closes early. In that case the
+    connection is closed, since unread body bytes would corrupt keep-alive.
     
-    handler.wfile.write(json.dumps(response).encode('utf-8'))
+    Args:
+        handler: HTTP request handler
+        
+    Returns:
+        Body bytes, or None if an error response was sent
+    """
+    try:
+        length = int(handler.headers.get('Content-Length', 0))
+    except ValueError:
+        length = -1
+    
+    if length <= 0 or length > POST_MAX_BODY_BYTES:
+        handler.close_connection = True
+    if length <= 0:
+        _send_json_bytes(handler, 400, _RESP_BAD_LENGTH)
+        return None
+    if length > POST_MAX_BODY_BYTES:
+        _send_json_bytes(handler, 413, _RESP_TOO_LARGE)
+        return None
+    
+    body = bytearray()
+    remaining = length
+    while remaining > 0:
+        chunk = handler.rfile.read(min(remaining, POST_READ_CHUNK))
+        if not chunk:
+            handler.close_connection = True
+            _send_json_bytes(handler, 400, _RESP_INCOMPLETE_BODY)
+            return None
+        body += chunk
+        remaining -= len(chunk)
+    
+    return bytes(body)
 
 
 def _handle_activate(handler, source: str) -> None:
@@ -1515,7 +1697,8 @@ def _handle_activate(handler, source: str) -> None:
         log("[activate] MDR block entered.")
     
     # Start writer and nowplaying
-    success, message = start_writer_and_nowplaying_for_source(source)
+    with source_switch_lock:
+        success, message = start_writer_and_nowplaying_for_source(source)
     
     # Log for MDR
     if source == 'mdr':
@@ -1526,7 +1709,8 @@ def _handle_activate(handler, source: str) -> None:
 
 def _handle_deactivate(handler) -> None:
     """Handle /deactivate endpoint."""
-    success, message = stop_current_writer_and_nowplaying()
+    with source_switch_lock:
+        success, message = stop_current_writer_and_nowplaying()
     _send_json_response(handler, 200, success, message)
 
 
@@ -1538,18 +1722,23 @@ def _handle_build_db(handler) -> None:
 
 def _handle_get_artist_not_sure_entries(handler) -> None:
     """Handle /get_artist_not_sure_entries endpoint."""
-    ans_path = SCRIPT_DIR / "missingsongs" / "artist_not_sure.jsonl"
-    entries = load_artist_not_sure_queue(ans_path)
+    entries = load_artist_not_sure_queue(ARTIST_NOT_SURE_QUEUE_PATH)
     _send_json_response(handler, 200, True, "", entries=entries)
 
 
 def _handle_enrich_missing(handler) -> None:
-    """Handle /run/enrich_missing endpoint."""
-    success, message = run_spotify_enrich_missing(
-        force=False,
-        update_existing=False,
-        verbose=True
-    )
+    """Handle /run/enrich_missing endpoint (one run at a time)."""
+    if not enrich_run_lock.acquire(blocking=False):
+        _send_json_response(handler, 409, False, "Enrichment is already running. See console.")
+        return
+    try:
+        success, message = run_spotify_enrich_missing(
+            force=False,
+            update_existing=False,
+            verbose=True
+        )
+    finally:
+        enrich_run_lock.release()
     _send_json_response(handler, 200, success, message)
 
 
@@ -1625,6 +1814,24 @@ def _handle_rtl_start_browser(handler) -> None:
     
     _send_json_response(handler, 200, success, message)
 
+
+# GET routes without a path argument (query string ignored for lookup)
+_GET_ROUTES: Dict[str, Callable[[Any], None]] = {
+    '/deactivate': _handle_deactivate,
+    '/get_artist_not_sure_entries': _handle_get_artist_not_sure_entries,
+    '/run/build_db': _handle_build_db,
+    '/run/enrich_missing': _handle_enrich_missing,
+    '/run/start_mdr': _handle_start_mdr,
+    '/run/gimick_repeat_counter': _handle_gimick_repeat_counter,
+    '/run/rtl_start_browser': _handle_rtl_start_browser,
+}
+
+# GET routes of the form /{prefix}/{arg}; the handler receives the arg
+_GET_ARG_ROUTES: Dict[str, Callable[[Any, str], None]] = {
+    'activate': _handle_activate,
+    'cmd': _handle_sleep_command,
+}
+
 # ==============================================================================
 # Knowledge Base & Index
 # ==============================================================================
@@ -4087,18 +4294,62 @@ def load_artist_not_sure_queue(path: Path) -> List[Dict[str, Any]]:
 
 
 def save_artist_not_sure_queue(path: Path, entries: List[Dict[str, Any]]) -> None:
-    """Write remaining entries back to artist_not_sure.jsonl."""
+    """Write remaining entries back to artist_not_sure.jsonl (one buffered write, atomic replace)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for entry in entries:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    tmp = path.with_suffix(f"{path.suffix}.tmp")
+    with tmp.open("w", encoding="utf-8", buffering=JSONL_WRITE_BUFFER) as f:
+        f.write(data)
+    os.replace(tmp, path)
 
 
 def save_artist_not_sure_reviewed(path: Path, entry: Dict[str, Any]) -> None:
-    """Append entry to reviewed.jsonl file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    """Queue entry for appending to reviewed.jsonl (written by a background thread)."""
+    global _reviewed_writer
+    
+    with _reviewed_writer_guard:
+        if _reviewed_writer is None:
+            _reviewed_writer = threading.Thread(
+                target=_reviewed_writer_loop, name="ans-reviewed", daemon=True
+            )
+            _reviewed_writer.start()
+    _reviewed_queue.put((path, entry))
+
+
+def _reviewed_writer_loop() -> None:
+    """Drain the reviewed queue in small time windows and append each batch at once."""
+    while True:
+        batch = [_reviewed_queue.get()]
+        deadline = time.monotonic() + REVIEWED_FLUSH_WINDOW_S
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_reviewed_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        try:
+            lines_by_path: Dict[Path, List[str]] = {}
+            for path, entry in batch:
+                lines_by_path.setdefault(path, []).append(json.dumps(entry, ensure_ascii=False) + "\n")
+            for path, lines in lines_by_path.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("ab") as f:
+                    f.write("".join(lines).encode("utf-8"))
+                    f.flush()
+                    os.fsync(f.fileno())
+        except Exception as e:
+            log(f"[ans_ui] Error writing reviewed entries: {e}")
+        finally:
+            for _ in batch:
+                _reviewed_queue.task_done()
+
+
+def flush_reviewed_entries() -> None:
+    """Block until every queued reviewed entry has been written."""
+    _reviewed_queue.join()
 
 
 def _parse_existing_notes_json(notes_raw: str) -> dict:
@@ -4232,10 +4483,50 @@ def update_kb_entry_notes(
         return False
 
 
+# Parsed KB reused across artist-not-sure actions while the file's
+# (mtime_ns, size) is unchanged. Guarded by artist_not_sure_lock.
+# dirty_gen counts in-memory edits, written_gen the last edit persisted.
+_ans_kb_cache: Dict[str, Any] = {
+    "path": None, "stamp": None, "data": None, "dirty_gen": 0, "written_gen": 0
+}
+
+
+def _kb_file_stamp(kb_path: Path) -> Tuple[int, int]:
+    """Return (mtime_ns, size) of the KB file for cache validation."""
+    st = kb_path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _pending_ans_kb_doc(kb_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached KB if it holds artist-not-sure edits for kb_path
+    that are not written yet, else None.
+    
+    Full KB rewrites (enrich save, DB builder) start from this instead of
+    the file so those edits are not lost. Caller holds kb_write_lock and
+    artist_not_sure_lock.
+    
+    Args:
+        kb_path: Path to KB file
+        
+    Returns:
+        The cached {"songs": [...]} document, or None
+    """
+    cache_path = _ans_kb_cache["path"]
+    pending = _ans_kb_cache["dirty_gen"] > _ans_kb_cache["written_gen"]
+    if pending and cache_path is not None and Path(cache_path).resolve() == Path(kb_path).resolve():
+        return _ans_kb_cache["data"]
+    return None
+
+
 def _load_kb_for_action(kb_path: Path) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
     """
     Load KB data for action processing.
     
+    Reuses the parsed KB from the previous action if the file has not
+    changed on disk since it was read or written by us, or if it holds
+    edits that are not written yet. Caller holds artist_not_sure_lock.
+    
     Args:
         kb_path: Path to KB file
         
@@ -4243,7 +4534,15 @@ def _load_kb_for_action(kb_path: Path) -> Optional[Tuple[Dict[str, Any], List[Di
         Tuple of (kb_data, kb_entries) or None on error
     """
     try:
-        kb_data = json.loads(kb_path.read_text(encoding="utf-8"))  # NOSONAR
+        if _ans_kb_cache["path"] == kb_path:
+            pending = _ans_kb_cache["dirty_gen"] > _ans_kb_cache["written_gen"]
+            if pending or _ans_kb_cache["stamp"] == _kb_file_stamp(kb_path):
+                kb_data = _ans_kb_cache["data"]
+                return kb_data, kb_data["songs"]
+        
+        stamp = _kb_file_stamp(kb_path)
+        
+        kb_data = _json_loads(kb_path.read_bytes())  # NOSONAR
         
         # Extract entries with proper type checking
         if isinstance(kb_data, dict) and isinstance(kb_data.get("songs"), list):
@@ -4258,6 +4557,7 @@ def _load_kb_for_action(kb_path: Path) -> Optional[Tuple[Dict[str, Any], List[Di
             log("[ans_ui] Invalid KB format (not dict with 'songs' list or list)")
             return None
         
+        _ans_kb_cache.update(path=kb_path, stamp=stamp, data=kb_data, dirty_gen=0, written_gen=0)
         return kb_data, kb_entries
         
     except Exception as e:
@@ -4320,24 +4620,60 @@ def _create_updated_notes(
         return target_kb_entry.get("notes", "")
 
 
-def _write_kb_data(kb_path: Path, kb_data: dict) -> bool:
+def _write_kb_data(kb_path: Path, kb_data: dict, gen: int = 0) -> bool:
     """
-    Write KB data to file.
+    Write KB data to file, coalescing concurrent writers.
+    
+    Serializes a snapshot of all in-memory edits so far. A writer whose
+    edit (gen) was already included in a later snapshot skips the write.
+    Caller must not hold artist_not_sure_lock.
     
     Args:
         kb_path: Path to KB file
         kb_data: KB data to write
+        gen: Edit generation that must be on disk afterwards (0 = always write)
         
     Returns:
         True if successful, False otherwise
     """
-    try:
-        with kb_path.open("w", encoding="utf-8") as f:
-            json.dump(kb_data, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception as e:
-        log(f"[ans_ui] Error writing KB: {e}")
-        return False
+    with kb_write_lock:
+        with artist_not_sure_lock:
+            if gen and _ans_kb_cache["written_gen"] >= gen:
+                return True  # Persisted by a concurrent writer's snapshot
+            snapshot_gen = _ans_kb_cache["dirty_gen"]
+            text = json.dumps(kb_data, ensure_ascii=False, indent=2)
+        
+        try:
+            with kb_path.open("w", encoding="utf-8") as f:
+                f.write(text)
+            # What we just wrote is what the cache holds - no re-read needed
+            with artist_not_sure_lock:
+                _ans_kb_cache.update(
+                    path=kb_path, stamp=_kb_file_stamp(kb_path), data=kb_data,
+                    written_gen=max(_ans_kb_cache["written_gen"], snapshot_gen)
+                )
+            return True
+        except Exception as e:
+            # Cached entry was already modified in memory; force a re-read next time
+            with artist_not_sure_lock:
+                _ans_kb_cache.update(path=None, stamp=None, data=None, dirty_gen=0, written_gen=0)
+            log(f"[ans_ui] Error writing KB: {e}")
+            return False
+
+
+def _queue_entry_key(entry: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    """
+    Build the lookup key of a queue entry.
+    
+    Args:
+        entry: Queue entry from artist_not_sure.jsonl
+        
+    Returns:
+        Tuple of (observed title, observed artist, KB title, KB artist)
+    """
+    obs = entry.get("observed") or {}
+    kb = entry.get("kb_entry") or {}
+    return (obs.get("title"), obs.get("artist"), kb.get("title"), kb.get("artist"))
 
 
 def _find_and_move_queue_entry(
@@ -4364,25 +4700,22 @@ def _find_and_move_queue_entry(
     """
     queue_entries = load_artist_not_sure_queue(queue_path)
     
-    for i, entry in enumerate(queue_entries):
-        obs = entry.get("observed", {})
-        kb = entry.get("kb_entry", {})
-        
-        if (
-            obs.get("title") == observed_title and
-            obs.get("artist") == observed_artist and
-            kb.get("title") == kb_entry_title and
-            kb.get("artist") == kb_entry_artist
-        ):
-            # Found it - move
-            entry_to_move = queue_entries.pop(i)
-            save_artist_not_sure_queue(queue_path, queue_entries)
-            save_artist_not_sure_reviewed(reviewed_path, entry_to_move)
-            log(f"[ans_ui] Entry moved: {observed_title} — {observed_artist}")
-            return True
+    # Compare one pre-built key tuple per entry (first match wins)
+    key = (observed_title, observed_artist, kb_entry_title, kb_entry_artist)
+    i = next(
+        (idx for idx, entry in enumerate(queue_entries) if _queue_entry_key(entry) == key),
+        None
+    )
+    if i is None:
+        log(f"[ans_ui] Entry not found in queue: {observed_title} — {observed_artist}")
+        return False
     
-    log(f"[ans_ui] Entry not found in queue: {observed_title} — {observed_artist}")
-    return False
+    # Found it - move
+    entry_to_move = queue_entries.pop(i)
+    save_artist_not_sure_queue(queue_path, queue_entries)
+    save_artist_not_sure_reviewed(reviewed_path, entry_to_move)
+    log(f"[ans_ui] Entry moved: {observed_title} — {observed_artist}")
+    return True
 
 
 def process_artist_not_sure_action(
@@ -4411,40 +4744,50 @@ def process_artist_not_sure_action(
     Returns:
         True if successful, False otherwise
     """
-    # Load KB
-    kb_result = _load_kb_for_action(kb_path)
-    if kb_result is None:
-        return False
-    
-    kb_data, kb_entries = kb_result
-    
-    # Find KB entry
-    target_kb_entry = _find_kb_entry(kb_entries, kb_entry_title, kb_entry_artist)
-    if not target_kb_entry:
-        log(f"[ans_ui] KB entry not found: {kb_entry_title} — {kb_entry_artist}")
-        return False
-    
-    # Create updated notes
-    new_notes_str = _create_updated_notes(target_kb_entry, action, observed_artist)
-    
-    # Update KB entry
-    target_kb_entry["notes"] = new_notes_str
-    
-    # Write KB back
-    if not _write_kb_data(kb_path, kb_data):
-        return False
+    edit_gen = 0
+    with artist_not_sure_lock:
+        # Load KB
+        kb_result = _load_kb_for_action(kb_path)
+        if kb_result is None:
+            return False
+        
+        kb_data, kb_entries = kb_result
+        
+        # Find KB entry
+        target_kb_entry = _find_kb_entry(kb_entries, kb_entry_title, kb_entry_artist)
+        if not target_kb_entry:
+            log(f"[ans_ui] KB entry not found: {kb_entry_title} — {kb_entry_artist}")
+            return False
+        
+        # Create updated notes
+        new_notes_str = _create_updated_notes(target_kb_entry, action, observed_artist)
+        
+        if new_notes_str != target_kb_entry.get("notes", ""):
+            # Update KB entry (in memory; persisted below)
+            target_kb_entry["notes"] = new_notes_str
+            _ans_kb_cache["dirty_gen"] += 1
+            edit_gen = _ans_kb_cache["dirty_gen"]
     
-    log(f"[ans_ui] KB updated: {kb_entry_title} — {kb_entry_artist}")
+    if not edit_gen:
+        # Idempotent action (e.g. artist already aliased) - skip full KB rewrite
+        log("[ans_ui] notes unchanged, skipping KB write")
+    else:
+        # Write KB back
+        if not _write_kb_data(kb_path, kb_data, edit_gen):
+            return False
+        
+        log(f"[ans_ui] KB updated: {kb_entry_title} — {kb_entry_artist}")
     
     # Move entry from queue to reviewed
-    _find_and_move_queue_entry(
-        queue_path,
-        reviewed_path,
-        observed_title,
-        observed_artist,
-        kb_entry_title,
-        kb_entry_artist
-    )
+    with artist_not_sure_lock:
+        _find_and_move_queue_entry(
+            queue_path,
+            reviewed_path,
+            observed_title,
+            observed_artist,
+            kb_entry_title,
+            kb_entry_artist
+        )
     
     return True
     
@@ -4613,7 +4956,9 @@ def _enrich_atomic_write_json_safe(path: Path, obj: Any) -> None:
     """
     Atomically write JSON data to file with security checks.
     
-    Uses temporary file and os.replace for atomic operation.
+    Uses temporary file and os.replace for atomic operation. The document
+    is serialized straight to bytes (orjson if installed) and written in
+    one buffered call, avoiding json.dump's many small text writes.
     
     Security:
     - Path is validated to be under ENRICH_SAFE_ROOT
@@ -4645,10 +4990,11 @@ def _enrich_atomic_write_json_safe(path: Path, obj: Any) -> None:
         # Write to temporary file
         # nosemgrep: python.lang.security.audit.dangerous-system-call.dangerous-system-call
         # Justification: path is validated above to be under ENRICH_SAFE_ROOT
-        with open(tmp, "w", encoding="utf-8", newline="\n") as f:
-            # json.dump is safe here - it writes JSON data, not executes paths
+        data = _json_dumps(obj)
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            # Writing serialized JSON bytes is safe here - no paths are executed
             # nosemgrep: python.lang.security.audit.dangerous-system-call.dangerous-system-call
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+            f.write(data)
             f.flush()
             os.fsync(f.fileno())
         
@@ -4751,6 +5097,10 @@ ENRICH_BACKUPS_DIR = _enrich_resolve_allowed_dir("BACKUPS_DIR")
 ENRICH_CLIENT_ID     = os.environ.get("CLIENT_ID") or os.environ.get("SPOTIFY_CLIENT_ID")
 ENRICH_CLIENT_SECRET = os.environ.get("CLIENT_SECRET") or os.environ.get("SPOTIFY_CLIENT_SECRET")
 
+# Parallel track search (IO-bound) and client-side Spotify rate limit
+ENRICH_MAX_WORKERS = 16
+ENRICH_MAX_CALLS_PER_SEC = 10
+
 # ===================== Logging =====================
 
 def _enrich_log(kind, msg):
@@ -4775,6 +5125,11 @@ def _enrich_v(msg):
 
 # ===================== Helpers =====================
 
+# Compiled once; these run per missing-log line / per item
+ENRICH_WS_RX = re.compile(r"\s+")
+ENRICH_DASH_SPLIT_RX = re.compile(r"\s[-—]\s")
+ENRICH_QUOTE_TBL = str.maketrans("", "", "'`")
+
 def _enrich_ensure_dirs():
     """
     Ensure all required directories exist.
@@ -4797,7 +5152,7 @@ def _enrich_norm_text(s: str) -> str:
     if not s: 
         return ""
     s = s.strip()
-    s = re.sub(r"\s+", " ", s)
+    s = ENRICH_WS_RX.sub(" ", s)
     return s
 
 def _enrich_alias_variants(title: str) -> list:
@@ -4832,10 +5187,40 @@ def _enrich_alias_variants(title: str) -> list:
     else:
         return [base, low]
 
+# Longest Retry-After sleep a single enrich worker will honour
+ENRICH_RETRY_AFTER_MAX_S = 10.0
+
+
+class _CappedRetry(urllib3.Retry):
+    """urllib3 Retry that honours Retry-After, but never sleeps longer than ENRICH_RETRY_AFTER_MAX_S."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, ENRICH_RETRY_AFTER_MAX_S)
+
+
+# Shared keep-alive pool for Spotify (thread-safe; retries 429/5xx with capped backoff)
+ENRICH_HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=ENRICH_MAX_WORKERS,
+    retries=_CappedRetry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+    timeout=urllib3.Timeout(total=30),
+)
+
 def _enrich_http_json(url, method="GET", headers=None, data=None, expect=200):
     """
     Make HTTP request and return status code and raw response.
     
+    Uses the pooled ENRICH_HTTP connection manager, so consecutive calls to
+    api.spotify.com reuse one TLS connection instead of reconnecting.
+    
     Args:
         url: Target URL
         method: HTTP method (default: "GET")
@@ -4849,24 +5234,23 @@ def _enrich_http_json(url, method="GET", headers=None, data=None, expect=200):
     Raises:
         ValueError: If status code doesn't match expected
     """
-    req = urllib.request.Request(url=url, method=method)
-    
-    for k, v in (headers or {}).items():
-        req.add_header(k, v)
+    hdrs = dict(headers or {})
     
     if data is not None and not isinstance(data, (bytes, bytearray)):
         data = json.dumps(data).encode("utf-8")
-        req.add_header("Content-Type", CONTENT_TYPE_JSON)
+        hdrs["Content-Type"] = CONTENT_TYPE_JSON
     
     try:
-        with urllib.request.urlopen(req, data=data, timeout=30) as resp:
-            code = resp.getcode()
-            raw = resp.read()
-    except urllib.error.HTTPError as e:
-        return e.code, e.read()
+        resp = ENRICH_HTTP.request(method, url, headers=hdrs, body=data)
+        code = resp.status
+        raw = resp.data
     except Exception as e:
         return None, str(e).encode("utf-8")
     
+    # HTTP errors are returned to the caller (like urllib's HTTPError before)
+    if code >= 400:
+        return code, raw
+    
     # Validate expected status code
     if expect is not None and code != expect:
         raise ValueError(
@@ -4877,6 +5261,40 @@ def _enrich_http_json(url, method="GET", headers=None, data=None, expect=200):
 
 # ===================== Spotify API =====================
 
+class _EnrichRateLimiter:
+    """
+    Thread-safe sliding-window rate limiter.
+    
+    Allows at most max_calls acquisitions per period seconds; callers
+    block until a slot frees up.
+    """
+    
+    def __init__(self, max_calls: int, period: float = 1.0):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_calls: Allowed calls per window
+            period: Window length in seconds
+        """
+        self.max_calls = max(1, max_calls)
+        self.period = period
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
 class _EnrichSpotify:
     """
     Spotify API client for enrichment operations.
@@ -4897,10 +5315,13 @@ class _EnrichSpotify:
         self.secret = secret
         self.token = None
         self.token_until = 0
+        self._token_lock = threading.Lock()  # searches run in a thread pool
+        self._hdr = None  # Authorization header dict for the current token
+        self._limiter = _EnrichRateLimiter(ENRICH_MAX_CALLS_PER_SEC)
 
     def get_token(self):
         """
-        Get valid access token (refreshes if expired).
+        Get valid access token (refreshes if expired, thread-safe).
         
         Returns:
             Valid access token string
@@ -4908,6 +5329,11 @@ class _EnrichSpotify:
         Raises:
             RuntimeError: If credentials not set or token request fails
         """
+        with self._token_lock:
+            return self._refresh_token()
+
+    def _refresh_token(self):
+        """Return cached token or request a new one (caller holds lock)."""
         now = time.time()
         if self.token and now < self.token_until - 30:
             return self.token
@@ -4924,19 +5350,28 @@ class _EnrichSpotify:
         )
         if code != 200:
             raise RuntimeError(f"Token request failed: {code} {raw[:200]}")
-        data = json.loads(raw)
+        data = _json_loads(raw)
         self.token = data["access_token"]
         self.token_until = time.time() + int(data.get("expires_in", 3600))
+        self._hdr = None
         return self.token
 
     def _auth_hdr(self):
         """
         Get authorization header dict with current token.
         
+        The dict is reused until the token nears expiry (read-only for
+        callers), so per-request calls skip the token lock entirely.
+        
         Returns:
             Dict with Authorization header
         """
-        return {"Authorization": f"Bearer {self.get_token()}"}
+        hdr = self._hdr
+        if hdr is not None and time.time() < self.token_until - 30:
+            return hdr
+        hdr = {"Authorization": f"Bearer {self.get_token()}"}
+        self._hdr = hdr
+        return hdr
 
     def search_track(self, title, artist=None):
         """
@@ -4953,18 +5388,19 @@ class _EnrichSpotify:
         if artist: 
             q += f" artist:{artist}"
         params = urllib.parse.urlencode({"q": q, "type":"track", "limit": 1})
+        self._limiter.acquire()
         code, raw = _enrich_http_json(f"https://api.spotify.com/v1/search?{params}", headers=self._auth_hdr())
         if code != 200:
             _enrich_v(f"Search warning {code}: {raw[:200]}")
             return None
-        items = json.loads(raw)["tracks"]["items"]
+        items = _json_loads(raw)["tracks"]["items"]
         return items[0] if items else None
 
     def tracks_audio_features(self, ids):
         """
         Fetch audio features for multiple tracks (batched).
         
-        Processes up to 100 tracks per request, handles rate limiting.
+        Processes up to 100 tracks per request; 429s are retried by ENRICH_HTTP.
         
         Args:
             ids: List of Spotify track IDs
@@ -4975,26 +5411,79 @@ class _EnrichSpotify:
         if not ids: 
             return {}
         out = {}
+        hdr = self._auth_hdr()  # once per batch run
         for i in range(0, len(ids), 100):
             chunk = ids[i:i+100]
             params = urllib.parse.urlencode({"ids": ",".join(chunk)})
-            code, raw = _enrich_http_json(f"https://api.spotify.com/v1/audio-features?{params}", headers=self._auth_hdr())
-            if code == 429:
-                retry = 1.5
-                _enrich_v("429 rate limit on audio-features -> retry once")
-                time.sleep(retry)
-                code, raw = _enrich_http_json(f"https://api.spotify.com/v1/audio-features?{params}", headers=self._auth_hdr())
+            # 429 is retried (with a capped Retry-After) by ENRICH_HTTP itself
+            code, raw = _enrich_http_json(f"https://api.spotify.com/v1/audio-features?{params}", headers=hdr)
             if code == 403:
                 _enrich_v("Warning: 403 on /audio-features -> skipping features (will still save KB).")
                 return out
             if code != 200:
                 _enrich_v(f"Warning {code} on audio-features: {raw[:200]}")
                 continue
-            for feat in json.loads(raw).get("audio_features", []) or []:
+            for feat in _json_loads(raw).get("audio_features", []) or []:
                 if feat and feat.get("id"):
                     out[feat["id"]] = feat
         return out
 
+    def get_tracks(self, ids):
+        """
+        Fetch full track objects for multiple IDs (batched).
+        
+        Processes up to 50 tracks per request (Spotify limit).
+        
+        Args:
+            ids: List of Spotify track IDs
+            
+        Returns:
+            Dict mapping track_id -> track object dict
+        """
+        if not ids:
+            return {}
+        out = {}
+        hdr = self._auth_hdr()  # once per batch run
+        for i in range(0, len(ids), 50):
+            chunk = ids[i:i+50]
+            params = urllib.parse.urlencode({"ids": ",".join(chunk)})
+            code, raw = _enrich_http_json(f"https://api.spotify.com/v1/tracks?{params}", headers=hdr)
+            if code != 200:
+                _enrich_v(f"Warning {code} on tracks: {raw[:200]}")
+                continue
+            for track in _json_loads(raw).get("tracks", []) or []:
+                if track and track.get("id"):
+                    out[track["id"]] = track
+        return out
+
+    def get_artists(self, ids):
+        """
+        Fetch artist objects for multiple IDs (batched).
+        
+        Processes up to 50 artists per request (Spotify limit).
+        
+        Args:
+            ids: List of Spotify artist IDs
+            
+        Returns:
+            Dict mapping artist_id -> artist object dict
+        """
+        if not ids:
+            return {}
+        out = {}
+        hdr = self._auth_hdr()  # once per batch run
+        for i in range(0, len(ids), 50):
+            chunk = ids[i:i+50]
+            params = urllib.parse.urlencode({"ids": ",".join(chunk)})
+            code, raw = _enrich_http_json(f"https://api.spotify.com/v1/artists?{params}", headers=hdr)
+            if code != 200:
+                _enrich_v(f"Warning {code} on artists: {raw[:200]}")
+                continue
+            for artist in _json_loads(raw).get("artists", []) or []:
+                if artist and artist.get("id"):
+                    out[artist["id"]] = artist
+        return out
+
     def get_artist(self, artist_id: str):
         """
         Fetch artist information by ID.
@@ -5009,11 +5498,10 @@ class _EnrichSpotify:
         if code != 200:
             _enrich_v(f"Artist warning {artist_id} -> {code}: {raw[:160]}")
             return None
-        return json.loads(raw)
+        return _json_loads(raw)
 
 # ===================== Tagging Helpers =====================
 
-ENRICH_DECADE_RX = re.compile(r"^(\d{4})")  # NOSONAR
 ENRICH_SPECIAL_KEYS = {
     "nightcore": ["nightcore"],
     "speed up": ["speed up", "sped up", "speedup"],
@@ -5044,6 +5532,33 @@ ENRICH_GENRE_MAP = {
     "eurodance": "dance",
 }
 
+def _enrich_build_matcher(pairs) -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton mapping keywords to tags.
+    
+    Args:
+        pairs: Iterable of (keyword, tag) tuples (keywords lowercase)
+        
+    Returns:
+        Ready automaton, or None if pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for key, tag in pairs:
+        automaton.add_word(key, tag)
+    automaton.make_automaton()
+    return automaton
+
+# One automaton over all genre keys -> single pass per genre string
+ENRICH_GENRE_AC = _enrich_build_matcher(ENRICH_GENRE_MAP.items())
+# Fallback scan table: lowercased UTF-8 keys (bytes search, tuple iteration)
+ENRICH_GENRE_ITEMS = tuple((k.lower().encode("utf-8"), t) for k, t in ENRICH_GENRE_MAP.items())
+# Keyword -> parent special tag (e.g. "sped up" -> "speed up")
+ENRICH_SPECIAL_AC = _enrich_build_matcher(
+    (k, tag) for tag, keys in ENRICH_SPECIAL_KEYS.items() for k in keys
+)
+
 def _enrich_tag_from_decade(release_date: str) -> str | None:
     """
     Extract decade tag from release date string.
@@ -5054,34 +5569,33 @@ def _enrich_tag_from_decade(release_date: str) -> str | None:
     Returns:
         Decade tag like "2020s", or None if parsing fails
     """
-    if not release_date:
-        return None
-    
-    m = ENRICH_DECADE_RX.search(release_date)
-    if not m:
+    if not release_date or len(release_date) < 4:
         return None
     
-    try:
-        year = int(m.group(1))
-    except (ValueError, TypeError, AttributeError):
+    # Leading "YYYY" - isdecimal() matches what the old ^(\d{4}) regex did
+    head = release_date[:4]
+    if not head.isdecimal():
         return None
     
-    decade = (year // 10) * 10
+    decade = (int(head) // 10) * 10
     return f"{decade}s"
 
-def _enrich_special_tags_from_title(title: str) -> list[str]:
+def _enrich_special_tags_from_title(title_lc: str) -> list[str]:
     """
     Extract special version tags from title.
     
     Detects tags like "nightcore", "speed up", "tiktok", "radio edit".
     
     Args:
-        title: Song title
+        title_lc: Song title, already lowercased by the caller
         
     Returns:
         List of detected special tags
     """
-    t = (title or "").lower()
+    t = title_lc or ""
+    if ENRICH_SPECIAL_AC is not None:
+        found = {tag for _, tag in ENRICH_SPECIAL_AC.iter(t)}
+        return [tag for tag in ENRICH_SPECIAL_KEYS if tag in found]
     return [tag for tag, keys in ENRICH_SPECIAL_KEYS.items() if any(k in t for k in keys)]
 
 def _enrich_map_artist_genres_to_tags(artist_genres: list[str]) -> set[str]:
@@ -5097,8 +5611,12 @@ def _enrich_map_artist_genres_to_tags(artist_genres: list[str]) -> set[str]:
     tags = set()
     for g in artist_genres or []:
         gl = g.lower()
-        for key, tag in ENRICH_GENRE_MAP.items():
-            if key in gl:
+        if ENRICH_GENRE_AC is not None:
+            tags.update(tag for _, tag in ENRICH_GENRE_AC.iter(gl))
+            continue
+        gl_b = gl.encode("utf-8")
+        for key_b, tag in ENRICH_GENRE_ITEMS:
+            if key_b in gl_b:
                 tags.add(tag)
     return tags
 
@@ -5113,15 +5631,18 @@ def _enrich_load_kb(path: Path):
         
     Returns:
         List of KB entry dicts, empty list if file doesn't exist
+        
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON (never treated
+            as an empty KB - that would overwrite it on save)
     """
     if not path.exists():
         return []
-    with path.open("r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            data = f.read()
-            return json.loads(data)
+    try:
+        return _json_loads(path.read_bytes())
+    except json.JSONDecodeError as e:
+        _enrich_log("err", f"KB decode failed: {path} ({e})")
+        raise
 
 def _parse_missing_json_line(line: str) -> Optional[Dict[str, str]]:
     """
@@ -5134,7 +5655,7 @@ def _parse_missing_json_line(line: str) -> Optional[Dict[str, str]]:
         Dict with title/artist/album, or None if invalid
     """
     try:
-        obj = json.loads(line)
+        obj = _json_loads(line)
     except json.JSONDecodeError:
         return None
     
@@ -5165,7 +5686,7 @@ def _parse_missing_text_line(line: str) -> Dict[str, str]:
     """
     # Try splitting by dash
     if " - " in line or " — " in line:
-        parts = re.split(r"\s[-—]\s", line, maxsplit=1)
+        parts = ENRICH_DASH_SPLIT_RX.split(line, maxsplit=1)
         title = parts[0].strip()
         artist = parts[1].strip() if len(parts) > 1 else ""
         return {"title": title, "artist": artist, "album": ""}
@@ -5193,44 +5714,51 @@ def _enrich_read_missing_lines(path: Path) -> List[Dict[str, str]]:
     out = []
     
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                s = line.strip()
-                if not s:
-                    continue
-                
-                # Try JSON parsing first
-                entry = _parse_missing_json_line(s)
-                
-                # Fallback to text parsing
-                if entry is None:
-                    entry = _parse_missing_text_line(s)
-                
-                out.append(entry)
-    
+        # Single read + C-level split instead of the per-line file iterator.
+        # split("\n") (not splitlines) so U+2028 etc. inside JSON stay intact.
+        data = path.read_text(encoding="utf-8")
     except OSError as e:
         _enrich_v(f"Error reading missing file {path}: {e}")
         return []
     
+    for line in data.split("\n"):
+        s = line.strip()
+        if not s:
+            continue
+        
+        # Try JSON parsing first
+        entry = _parse_missing_json_line(s)
+        
+        # Fallback to text parsing
+        if entry is None:
+            entry = _parse_missing_text_line(s)
+        
+        out.append(entry)
+    
     return out
 
-def _enrich_norm_key(title, artist):
+def _enrich_norm_clean(x: str) -> str:
+    """Strip, collapse whitespace and unify quotes of an already lowercased string."""
+    x = ENRICH_WS_RX.sub(" ", x.strip())
+    return x.translate(ENRICH_QUOTE_TBL)
+
+
+def _enrich_norm_key(title, artist, title_is_lower: bool = False):
     """
     Normalize title and artist for duplicate detection.
     
     Args:
         title: Song title
         artist: Artist name
+        title_is_lower: Title is already lowercased (skips a second .lower())
         
     Returns:
         Tuple of (normalized_title, normalized_artist)
     """
-    def clean(x):
-        x = (x or "").lower().strip()
-        x = re.sub(r"\s+", " ", x)
-        x = re.sub(r"['`]", "", x)
-        return x
-    return clean(title), clean(artist)
+    title = title or ""
+    if not title_is_lower:
+        title = title.lower()
+    return _enrich_norm_clean(title), _enrich_norm_clean((artist or "").lower())
 
 # ===================== Main Function =====================
 
@@ -5260,24 +5788,24 @@ def _validate_credentials() -> Tuple[bool, str]:
     return True, ""
 
 
-def _load_kb_with_index() -> Tuple[List[dict], set, dict]:
+def _load_kb_with_index() -> Tuple[List[dict], KeysView, dict]:
     """
     Load KB and build lookup index.
     
     Returns:
-        Tuple of (kb_list, seen_keys, kb_index)
+        Tuple of (kb_list, seen_keys, kb_index); seen_keys is a live view
+        of kb_index's keys, so adding to kb_index updates it too
     """
     kb = _enrich_load_kb(ENRICH_KB_PATH)
-    seen = set()
-    kb_index = {}
-    
-    for entry in kb:
-        key = _enrich_norm_key(entry.get("title", ""), entry.get("artist", ""))
-        seen.add(key)
-        kb_index[key] = entry
+    if isinstance(kb, dict) and isinstance(kb.get("songs"), list):
+        kb = kb["songs"]  # wrapped format (as written by the artist-not-sure panel)
+    kb_index = {
+        _enrich_norm_key(entry.get("title", ""), entry.get("artist", "")): entry
+        for entry in kb
+    }
     
     _enrich_v(f"KB entries: {len(kb)}")
-    return kb, seen, kb_index
+    return kb, kb_index.keys(), kb_index
 
 
 def _load_id_cache(cache_file: Path) -> dict:
@@ -5286,7 +5814,7 @@ def _load_id_cache(cache_file: Path) -> dict:
         return {}
     
     try:
-        return json.loads(cache_file.read_text(encoding="utf-8"))  # NOSONAR - internal cache path
+        return _json_loads(cache_file.read_bytes())  # NOSONAR - internal cache path
     except Exception:
         return {}
 
@@ -5294,9 +5822,8 @@ def _load_id_cache(cache_file: Path) -> dict:
 def _save_id_cache(cache_file: Path, id_cache: dict) -> None:
     """Save Spotify ID cache to file."""
     try:
-        cache_file.write_text(  # NOSONAR - internal cache path from config, not user-controlled
-            json.dumps(id_cache, ensure_ascii=False, indent=2),
-            encoding="utf-8"
+        cache_file.write_bytes(  # NOSONAR - internal cache path from config, not user-controlled
+            _json_dumps(id_cache)
         )
     except Exception as e:
         _enrich_v(f"Warning: cache save failed: {e}")
@@ -5313,12 +5840,15 @@ def _resolve_track_id(
     """
     Resolve Spotify track ID (with cache).
     
+    Does not write id_cache (runs in worker threads); the caller stores
+    IDs of fresh search results, recognizable by a non-None track.
+    
     Args:
         sp: Spotify API client
         title: Song title
         artist: Artist name
         key: Cache key
-        id_cache: ID cache dict
+        id_cache: ID cache dict (read-only here)
         force: Ignore cache if True
         
     Returns:
@@ -5336,16 +5866,72 @@ def _resolve_track_id(
         _enrich_v(f"Warning: not found -> {title} — {artist}")
         return None, None
     
-    track_id = track["id"]
-    id_cache[key] = track_id
+    return track["id"], track
+
+
+def _hydrate_missing_tracks(sp: '_EnrichSpotify', items: List['_EnrichItem']) -> None:
+    """
+    Fetch track objects for items resolved from the ID cache (in-place).
+    
+    Cache hits only carry a track ID; one batched /tracks call per 50 IDs
+    replaces the former per-item request.
+    
+    Args:
+        sp: Spotify API client
+        items: Resolved items (track filled in where found)
+    """
+    ids = list(dict.fromkeys(it.track_id for it in items if it.track is None))
+    if not ids:
+        return
     
-    return track_id, track
+    tracks = sp.get_tracks(ids)
+    _enrich_v(f"Hydrated {len(tracks)}/{len(ids)} cached track IDs")
+    
+    for it in items:
+        if it.track is None:
+            it.track = tracks.get(it.track_id)
 
 
-def _fill_missing_metadata(
+def _primary_artist_id(track: Optional[dict]) -> Optional[str]:
+    """Return the Spotify ID of the track's first artist (or None)."""
+    artists = (track.get("artists") or []) if track else []
+    return artists[0].get("id") if artists else None
+
+
+def _fetch_artist_genres(
     sp: '_EnrichSpotify',
+    items: List['_EnrichItem'],
+    artist_cache: dict,
+    force: bool
+) -> None:
+    """
+    Fill artist_cache (artist_id -> genre list) for all primary artists.
+    
+    Uses one batched /artists call per 50 unknown artists; cached artists
+    cost no request at all.
+    
+    Args:
+        sp: Spotify API client
+        items: Resolved (and hydrated) items
+        artist_cache: Artist genre cache (modified in-place)
+        force: Refetch artists already in the cache
+    """
+    ids = {_primary_artist_id(it.track) for it in items}
+    ids.discard(None)
+    todo = sorted(ids if force else ids - artist_cache.keys())
+    if not todo:
+        return
+    
+    artists = sp.get_artists(todo)
+    _enrich_v(f"Artist genres fetched: {len(artists)}/{len(todo)}")
+    
+    for artist_id, artist in artists.items():
+        genres = artist.get("genres")
+        artist_cache[artist_id] = genres if isinstance(genres, list) else []
+
+
+def _fill_missing_metadata(
     track: Optional[dict],
-    track_id: str,
     artist: str,
     album: str
 ) -> Tuple[str, str]:
@@ -5353,26 +5939,13 @@ def _fill_missing_metadata(
     Fill missing artist/album from track details.
     
     Args:
-        sp: Spotify API client
         track: Track object (may be None)
-        track_id: Spotify track ID
         artist: Current artist (may be empty)
         album: Current album (may be empty)
         
     Returns:
         Tuple of (artist, album) with filled values
     """
-    # Fetch track if not provided
-    if track is None and track_id:
-        params = urllib.parse.urlencode({"ids": track_id})
-        code, raw = _enrich_http_json(
-            f"https://api.spotify.com/v1/tracks?{params}",
-            headers=sp._auth_hdr()
-        )
-        if code == 200:
-            arr = json.loads(raw).get("tracks") or []
-            track = arr[0] if arr else None
-    
     # Fill artist
     if track and not artist:
         artist = ", ".join([a["name"] for a in track.get("artists", [])])
@@ -5385,17 +5958,19 @@ def _fill_missing_metadata(
 
 
 def _build_tags_for_track(
-    sp: '_EnrichSpotify',
     track: Optional[dict],
-    title: str
+    title_lc: str,
+    artist_cache: dict,
+    artist_tags_memo: Dict[str, frozenset]
 ) -> set:
     """
     Build tag set for track.
     
     Args:
-        sp: Spotify API client
         track: Track object
-        title: Song title
+        title_lc: Lowercased song title
+        artist_cache: Artist genre cache (artist_id -> genre list)
+        artist_tags_memo: Per-run memo (artist_id -> mapped genre tags)
         
     Returns:
         Set of tags
@@ -5411,18 +5986,17 @@ def _build_tags_for_track(
     except Exception:
         pass
     
-    # Artist genre tags
-    try:
-        primary_artist = (track.get("artists") or [])[0] if track else None
-        if primary_artist and primary_artist.get("id"):
-            artist_obj = sp.get_artist(primary_artist["id"])
-            if artist_obj and isinstance(artist_obj.get("genres"), list):
-                tags_set |= _enrich_map_artist_genres_to_tags(artist_obj["genres"])
-    except Exception as e:
-        _enrich_v(f"Warning fetching artist genres: {e}")
+    # Artist genre tags (prefetched in batches, mapped once per artist)
+    artist_id = _primary_artist_id(track)
+    artist_tags = artist_tags_memo.get(artist_id)
+    if artist_tags is None and artist_id:
+        artist_tags = frozenset(_enrich_map_artist_genres_to_tags(artist_cache.get(artist_id) or []))
+        artist_tags_memo[artist_id] = artist_tags
+    if artist_tags:
+        tags_set.update(artist_tags)
     
     # Special tags from title
-    tags_set |= set(_enrich_special_tags_from_title(title))
+    tags_set.update(_enrich_special_tags_from_title(title_lc))
     
     return tags_set
 
@@ -5442,14 +6016,20 @@ def _update_existing_entry(
         title: Song title (for aliases)
         album: Album name
     """
-    # Merge tags
-    old_tags = set(entry.get("tags") or [])
-    entry["tags"] = sorted(old_tags | tags_set)
+    # Merge tags (re-sort only if something new was added)
+    old_tags = entry.get("tags")
+    if not old_tags:
+        entry["tags"] = sorted(tags_set)
+    else:
+        old_set = set(old_tags)
+        if not tags_set <= old_set:
+            old_set.update(tags_set)
+            entry["tags"] = sorted(old_set)
     
     # Merge aliases
     alias_src = _enrich_alias_variants(title)
     old_aliases = entry.get("aliases") or []
-    alias_lc = {a.lower(): a for a in old_aliases}
+    alias_lc = {a.lower() for a in old_aliases}
     
     for alias in alias_src:
         if alias.lower() not in alias_lc:
@@ -5485,14 +6065,14 @@ def _create_new_entry(
         "artist": artist,
         "album": album or "",
         "aliases": _enrich_alias_variants(title),
-        "tags": sorted(tags_set) if tags_set else [],
+        "tags": list(tags_set),  # sorted once in _save_enriched_kb
         "notes": ""
     }
 
 
 def _add_audio_features(
     sp: '_EnrichSpotify',
-    new_entries: List[Tuple[dict, str]]
+    new_entries: List[Tuple[dict, str, tuple]]
 ) -> None:
     """
     Fetch and add audio features to new entries.
@@ -5502,9 +6082,9 @@ def _add_audio_features(
     
     Args:
         sp: Spotify API client
-        new_entries: List of (entry, track_id) tuples (modified in-place)
+        new_entries: List of (entry, track_id, norm_key) tuples (modified in-place)
     """
-    track_ids = [tid for _, tid in new_entries]
+    track_ids = [tid for _, tid, _ in new_entries]
     
     if not track_ids:
         return
@@ -5515,7 +6095,7 @@ def _add_audio_features(
         features = sp.tracks_audio_features(track_ids)
         _enrich_v(f"Features batch got: {list(features.keys())[:3]}{'...' if len(features) > 3 else ''}")
         
-        for entry, track_id in new_entries:
+        for entry, track_id, _ in new_entries:
             feat = features.get(track_id)
             if feat:
                 entry.setdefault("notes", "")
@@ -5527,23 +6107,65 @@ def _add_audio_features(
         _enrich_v(f"Warning: features fetch failed: {e}")
 
 
+# Fields an enrich run owns on existing entries; everything else (e.g. notes
+# edited in the artist-not-sure panel meanwhile) is kept from the fresh KB
+ENRICH_UPDATE_FIELDS = ("tags", "aliases", "album")
+
+
+def _merge_enriched_entries(
+    songs: List[dict],
+    new_entries: List[Tuple[dict, str, tuple]],
+    updated_entries: Dict[tuple, dict]
+) -> None:
+    """
+    Merge an enrich run's results into a freshly read KB entry list (in place).
+    
+    Args:
+        songs: KB entries as currently on disk / in the panel's cache
+        new_entries: List of (entry, track_id, norm_key) tuples to add
+        updated_entries: norm_key -> entry updated by this run
+    """
+    index = {
+        _enrich_norm_key(entry.get("title", ""), entry.get("artist", "")): entry
+        for entry in songs
+    }
+    
+    for k_norm, src in updated_entries.items():
+        dst = index.get(k_norm)
+        if dst is not None and dst is not src:
+            for field in ENRICH_UPDATE_FIELDS:
+                if field in src:
+                    dst[field] = src[field]
+    
+    for entry, _, k_norm in new_entries:
+        if k_norm not in index:  # may have been added since the run started
+            songs.append(entry)
+            index[k_norm] = entry
+    
+    # Stable tag order for the JSON file (also drops legacy duplicates)
+    for entry in songs:
+        tags = entry.get("tags")
+        if tags and isinstance(tags, list):
+            entry["tags"] = sorted(set(tags))
+
+
 def _save_enriched_kb(
-    kb: List[dict],
-    new_entries: List[Tuple[dict, str]],
-    seen: set,
-    kb_index: dict,
+    new_entries: List[Tuple[dict, str, tuple]],
+    updated_entries: Dict[tuple, dict],
     added_count: int,
     updated_count: int,
     skipped_count: int
 ) -> Tuple[bool, str]:
     """
-    Save enriched KB to file.
+    Merge the run's results into the current KB and save it.
+    
+    The KB is re-read under kb_write_lock (or taken from the artist-not-sure
+    cache if it holds unwritten edits), so changes made while the run was
+    talking to Spotify are kept. The panel's KB cache is reset afterwards.
     
     Args:
-        kb: KB entries list
-        new_entries: List of (entry, track_id) tuples
-        seen: Set of seen keys
-        kb_index: KB index dict
+        new_entries: List of (entry, track_id, norm_key) tuples
+        updated_entries: norm_key -> entry updated by this run
         added_count: Number of entries added
         updated_count: Number of entries updated
         skipped_count: Number of entries skipped
@@ -5552,20 +6174,32 @@ def _save_enriched_kb(
         Tuple of (success, message)
     """
     try:
-        # Backup
-        dst = _enrich_backup_songs_kb_safe(ENRICH_KB_PATH, ENRICH_BACKUPS_DIR)
-        if dst:
-            _enrich_v(f"Backup -> {dst}")
-        
-        # Add new entries
-        for entry, _ in new_entries:
-            kb.append(entry)
-            key = _enrich_norm_key(entry["title"], entry["artist"])
-            seen.add(key)
-            kb_index[key] = entry
-        
-        # Write KB
-        _enrich_atomic_write_json_safe(ENRICH_KB_PATH, kb)
+        with kb_write_lock, artist_not_sure_lock:
+            # Backup
+            dst = _enrich_backup_songs_kb_safe(ENRICH_KB_PATH, ENRICH_BACKUPS_DIR)
+            if dst:
+                _enrich_v(f"Backup -> {dst}")
+            
+            doc = _pending_ans_kb_doc(ENRICH_KB_PATH)  # disk + panel edits not written yet
+            if doc is not None:
+                songs = doc["songs"]
+            else:
+                doc = _enrich_load_kb(ENRICH_KB_PATH)
+                if isinstance(doc, dict) and isinstance(doc.get("songs"), list):
+                    songs = doc["songs"]
+                elif isinstance(doc, list):
+                    songs = doc
+                else:
+                    raise ValueError("unexpected KB format")
+            
+            _merge_enriched_entries(songs, new_entries, updated_entries)
+            
+            # Write KB
+            _enrich_atomic_write_json_safe(ENRICH_KB_PATH, doc)
+            
+            # Panel re-reads next time; pending panel writers hold `doc` itself,
+            # so a rewrite from them still contains this run's entries
+            _ans_kb_cache.update(path=None, stamp=None, data=None, dirty_gen=0, written_gen=0)
         
         _enrich_log("ok", f"Added={added_count} Updated={updated_count} Skipped={skipped_count} -> {ENRICH_KB_PATH.name}")
         
@@ -5576,17 +6210,37 @@ def _save_enriched_kb(
         return False, f"Error saving new songs_kb.json: {e}"
 
 
-def _process_single_item(
+@dataclass
+class _EnrichItem:
+    """
+    Missing song resolved to a Spotify track (enrichment phase 1 result).
+    
+    Attributes:
+        title: Normalized title
+        artist: Normalized artist (may be empty)
+        album: Normalized album (may be empty)
+        key: ID cache key
+        track_id: Spotify track ID
+        track: Full track object (None until hydrated for cache hits)
+    """
+    title: str
+    artist: str
+    album: str
+    key: str
+    track_id: str
+    track: Optional[dict] = None
+
+
+def _resolve_single_item(
     item: dict,
     sp: '_EnrichSpotify',
     id_cache: dict,
     force: bool,
     update_existing: bool,
-    seen: set,
-    kb_index: dict
-) -> Tuple[Optional[Tuple[dict, str]], bool, bool, bool]:
+    seen: KeysView
+) -> Optional[_EnrichItem]:
     """
-    Process a single missing song item.
+    Resolve a single missing song item to a Spotify track ID.
     
     Args:
         item: Item dict with title/artist/album
@@ -5594,19 +6248,22 @@ def _process_single_item(
         id_cache: Track ID cache
         force: Force fresh searches
         update_existing: Update existing entries
-        seen: Set of seen keys
-        kb_index: KB index dict
+        seen: Seen norm keys (view of kb_index keys, read-only here)
         
     Returns:
-        Tuple of (new_entry_tuple, was_added, was_updated, was_skipped)
-        new_entry_tuple is (entry, track_id) or None
+        Resolved item, or None if it should be skipped
     """
     title = _enrich_norm_text(item.get("title", ""))
     artist = _enrich_norm_text(item.get("artist", ""))
     album = _enrich_norm_text(item.get("album", ""))
     
     if not title:
-        return None, False, False, True
+        return None
+    
+    # Already in KB and nothing to update -> skip before any network call
+    if not update_existing and not force and _enrich_norm_key(title, artist) in seen:
+        _enrich_v(f"Skip (exists): {title} — {artist}")
+        return None
     
     key = f"{title}|{artist}".lower()
     
@@ -5614,23 +6271,55 @@ def _process_single_item(
     track_id, track = _resolve_track_id(sp, title, artist, key, id_cache, force)
     
     if track_id is None:
-        return None, False, False, True
+        return None
+    
+    return _EnrichItem(title, artist, album, key, track_id, track)
+
+
+def _process_single_item(
+    res: _EnrichItem,
+    artist_cache: dict,
+    artist_tags_memo: Dict[str, frozenset],
+    update_existing: bool,
+    seen: KeysView,
+    kb_index: dict,
+    updated_entries: Dict[tuple, dict]
+) -> Tuple[Optional[Tuple[dict, str, tuple]], bool, bool, bool]:
+    """
+    Build tags and add/update the KB entry for a resolved item.
+    
+    Args:
+        res: Resolved (and hydrated) item
+        artist_cache: Artist genre cache (artist_id -> genre list)
+        artist_tags_memo: Per-run memo (artist_id -> mapped genre tags)
+        update_existing: Update existing entries
+        seen: Seen norm keys (view of kb_index keys)
+        kb_index: KB index dict
+        updated_entries: Collects norm_key -> entry for updated entries
+        
+    Returns:
+        Tuple of (new_entry_tuple, was_added, was_updated, was_skipped)
+        new_entry_tuple is (entry, track_id, norm_key) or None
+    """
+    title, artist, album, track = res.title, res.artist, res.album, res.track
     
     # Fill missing metadata
-    if (not artist or not album) or track is None:
-        artist, album = _fill_missing_metadata(sp, track, track_id, artist, album)
+    if not artist or not album:
+        artist, album = _fill_missing_metadata(track, artist, album)
     
-    # Build tags
-    tags_set = _build_tags_for_track(sp, track, title)
+    # Build tags (title lowercased once for all helpers)
+    title_lc = title.lower()
+    tags_set = _build_tags_for_track(track, title_lc, artist_cache, artist_tags_memo)
     
     # Check if exists
-    k_norm = _enrich_norm_key(title, artist)
+    k_norm = _enrich_norm_key(title_lc, artist, title_is_lower=True)
     exists = k_norm in seen
     
     # Update existing
     if exists and update_existing:
         entry = kb_index[k_norm]
         _update_existing_entry(entry, tags_set, title, album)
+        updated_entries[k_norm] = entry
         _enrich_log("i", f"Updated: {entry['title']} — {entry['artist']} (tags={len(entry['tags'])})")
         return None, False, True, False
     
@@ -5643,7 +6332,7 @@ def _process_single_item(
     entry = _create_new_entry(title, artist, album, tags_set)
     _enrich_log("i", f"Added: {entry['title']} — {entry['artist']}")
     
-    return (entry, track_id), True, False, False
+    return (entry, res.track_id, k_norm), True, False, False
 
 
 def run_spotify_enrich_missing(
@@ -5677,11 +6366,20 @@ def run_spotify_enrich_missing(
     _enrich_ensure_dirs()
     
     # Load KB
-    kb, seen, kb_index = _load_kb_with_index()
+    try:
+        _, seen, kb_index = _load_kb_with_index()
+    except json.JSONDecodeError:
+        return False, f"{ENRICH_KB_PATH.name} is not valid JSON. Enrichment aborted."
     
     # Load missing songs
     todo = _enrich_read_missing_lines(ENRICH_MISS_PATH)
-    _enrich_v(f"Missing lines: {len(todo)}")
+    
+    # Songs missed in many sessions repeat in the log -> one search each
+    unique_todo = {}
+    for item in todo:
+        unique_todo.setdefault(_enrich_norm_key(item["title"], item["artist"]), item)
+    _enrich_v(f"Missing lines: {len(todo)} (unique: {len(unique_todo)})")
+    todo = list(unique_todo.values())
     
     if not todo:
         return True, "No entries found in missing_songs_log.jsonl to enrich."
@@ -5689,19 +6387,46 @@ def run_spotify_enrich_missing(
     # Initialize Spotify client
     sp = _EnrichSpotify(ENRICH_CLIENT_ID, ENRICH_CLIENT_SECRET)
     
-    # Load ID cache
+    # Load ID + artist genre caches
     cache_file = ENRICH_CACHE_DIR / "id_cache.json"
     id_cache = _load_id_cache(cache_file)
+    artist_cache_file = ENRICH_CACHE_DIR / "artist_cache.json"
+    artist_cache = _load_id_cache(artist_cache_file)
     
     # Process all items
     new_entries = []
+    updated_entries: Dict[tuple, dict] = {}
     updated_count = 0
     added_count = 0
     skipped_count = 0
     
-    for item in todo:
+    # Phase 1: resolve track IDs (search or ID cache), searches in parallel
+    with ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS) as ex:
+        results = list(ex.map(
+            lambda it: _resolve_single_item(it, sp, id_cache, force, update_existing, seen), todo
+        ))
+    
+    resolved = []
+    for res in results:
+        if res is None:
+            skipped_count += 1
+            continue
+        if res.track is not None:
+            id_cache[res.key] = res.track_id  # fresh search result
+        resolved.append(res)
+    
+    # Cache hits carry no track object -> fetch them in batches of 50
+    _hydrate_missing_tracks(sp, resolved)
+    
+    # Genres of all primary artists in batches of 50 (cached across runs)
+    _fetch_artist_genres(sp, resolved, artist_cache, force)
+    # artist_id -> mapped tags; local to this run, so overlapping runs never share it
+    artist_tags_memo: Dict[str, frozenset] = {}
+    
+    # Phase 2: tags + KB entries
+    for res in resolved:
         new_entry, was_added, was_updated, was_skipped = _process_single_item(
-            item, sp, id_cache, force, update_existing, seen, kb_index
+            res, artist_cache, artist_tags_memo, update_existing, seen, kb_index, updated_entries
         )
         
         if new_entry:
@@ -5722,12 +6447,13 @@ def run_spotify_enrich_missing(
         _enrich_v(f"Nothing to write. Skipped={skipped_count}")
         return True, f"Done. No new entries added or updated. Skipped: {skipped_count}"
     
-    # Save cache
+    # Save caches
     _save_id_cache(cache_file, id_cache)
+    _save_id_cache(artist_cache_file, artist_cache)
     
     # Save KB
     return _save_enriched_kb(
-        kb, new_entries, seen, kb_index,
+        new_entries, updated_entries,
         added_count, updated_count, skipped_count
     )
 
@@ -5973,6 +6699,81 @@ def start_writer_and_nowplaying_for_source(config_name: str) -> Tuple[bool, str]
         return False, f"Error starting for '{config_name}': {e}"
 
 
+# Compressed static panel assets: (path, encoding) -> (mtime_ns, body).
+# Files only change between restarts in practice; mtime guards manual edits.
+STATIC_COMPRESS_SUFFIXES = (".html", ".css", ".js")
+STATIC_COMPRESS_MIN_BYTES = 1024
+# (path, coding) -> (mtime_ns, body); body None marks "too small, serve as is"
+_static_compressed: Dict[Tuple[str, str], Tuple[int, Optional[bytes]]] = {}
+
+
+def _accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a content coding.
+    
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        coding: Content coding to look for (e.g. "gzip", "br")
+        
+    Returns:
+        True if listed without q=0
+    """
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() != coding:
+            continue
+        q = params.strip().replace(" ", "")
+        return q not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _compress_static_asset(path: str, coding: str) -> Optional[bytes]:
+    """
+    Return the compressed body of a static asset, cached per mtime.
+    
+    Args:
+        path: Filesystem path of the asset
+        coding: "br" or "gzip"
+        
+    Returns:
+        Compressed bytes, or None if the file is missing or too small
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    
+    cached = _static_compressed.get((path, coding))
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < STATIC_COMPRESS_MIN_BYTES:
+        _static_compressed[(path, coding)] = (mtime_ns, None)  # don't re-read it next request
+        return None
+    
+    if coding == "br":
+        body = brotli.compress(raw, quality=11)
+    else:
+        body = gzip.compress(raw, compresslevel=9, mtime=0)
+    
+    _static_compressed[(path, coding)] = (mtime_ns, body)
+    return body
+
+
+def precompress_static_assets() -> None:
+    """Compress all panel HTML/CSS/JS once at startup."""
+    codings = ("br", "gzip") if brotli is not None else ("gzip",)
+    count = 0
+    for path in OBSHTML_DIR.rglob("*"):
+        if path.suffix.lower() in STATIC_COMPRESS_SUFFIXES and path.is_file():
+            for coding in codings:
+                if _compress_static_asset(str(path), coding) is not None:
+                    count += 1
+    log(f"[static] Pre-compressed {count} panel asset variant(s) ({', '.join(codings)})")
+
+
 class MyHandler(http.server.SimpleHTTPRequestHandler):
     """
     HTTP request handler for the web control interface.
@@ -5982,10 +6783,102 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
     Handles POST requests for artist-not-sure conflict resolution.
     """
     
+    # Keep-alive for panel polling; every response must carry Content-Length
+    protocol_version = "HTTP/1.1"
+    
+    # Buffer headers + body into one send() and flush without Nagle delay
+    disable_nagle_algorithm = True
+    wbufsize = -1
+    
     def __init__(self, *args, **kwargs):
         """Initialize handler with OBSHTML_DIR as document root."""
         super().__init__(*args, directory=str(OBSHTML_DIR), **kwargs)
     
+    def send_head(self):
+        """
+        Serve a pre-compressed variant of panel HTML/CSS/JS when accepted.
+        
+        Falls back to the default static file handling for everything else.
+        
+        Returns:
+            File-like object for the body, or None
+        """
+        accept = self.headers.get('Accept-Encoding', '')
+        path = self.translate_path(self.path)
+        if not accept or not path.lower().endswith(STATIC_COMPRESS_SUFFIXES) or not os.path.isfile(path):
+            return super().send_head()
+        
+        for coding in ("br", "gzip"):
+            if coding == "br" and brotli is None:
+                continue
+            if not _accepts_encoding(accept, coding):
+                continue
+            body = _compress_static_asset(path, coding)
+            if body is None:
+                break
+            
+            mtime = int(os.path.getmtime(path))
+            if self._not_modified_since(mtime):
+                self.send_response(304)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.send_header('Last-Modified', self.date_time_string(mtime))
+                self.end_headers()
+                return None
+            
+            self.send_response(200)
+            self.send_header('Content-type', self.guess_type(path))
+            self.send_header('Content-Encoding', coding)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Last-Modified', self.date_time_string(mtime))
+            self.end_headers()
+            return io.BytesIO(body)
+        
+        return super().send_head()
+    
+    def _not_modified_since(self, mtime: int) -> bool:
+        """
+        Check If-Modified-Since against a file's mtime (same rules as the stdlib handler).
+        
+        Args:
+            mtime: File mtime in whole seconds (as sent in Last-Modified)
+            
+        Returns:
+            True if the client's copy is current and a 304 should be sent
+        """
+        ims_header = self.headers.get('If-Modified-Since')
+        if not ims_header or 'If-None-Match' in self.headers:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(ims_header)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=timezone.utc)
+        return datetime.fromtimestamp(mtime, timezone.utc) <= ims
+    
+    def copyfile(self, source, outputfile):
+        """
+        Copy a static file to the client, zero-copy where possible.
+        
+        Regular files go through socket.sendfile() (os.sendfile on Linux,
+        plain send loop elsewhere); anything else uses the default copy.
+        
+        Args:
+            source: Open file object from send_head()
+            outputfile: Output stream (self.wfile)
+        """
+        try:
+            source.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+        
+        if outputfile is not self.wfile:
+            return super().copyfile(source, outputfile)
+        
+        self.wfile.flush()
+        self.connection.sendfile(source)
+    
     def do_GET(self):
         """
         Process incoming GET requests.
@@ -6000,34 +6893,20 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
             /run/start_mdr - Start MDR helper script
             /get_artist_not_sure_entries - Get pending artist conflicts
         """
-        # Route to handlers
-        if self.path.startswith('/activate/'):
-            source = self.path.split('/')[-1]
-            _handle_activate(self, source)
-        
-        elif self.path == '/deactivate':
-            _handle_deactivate(self)
-        
-        elif self.path.startswith('/run/build_db'):
-            _handle_build_db(self)
-        
-        elif self.path == '/get_artist_not_sure_entries':
-            _handle_get_artist_not_sure_entries(self)
-        
-        elif self.path.startswith('/run/enrich_missing'):
-            _handle_enrich_missing(self)
-        
-        elif self.path.startswith('/run/start_mdr'):
-            _handle_start_mdr(self)
-        
-        elif self.path.startswith('/run/gimick_repeat_counter'):
-            _handle_gimick_repeat_counter(self)
-        
-        elif self.path.startswith('/run/rtl_start_browser'):
-            _handle_rtl_start_browser(self)
-        elif self.path.startswith('/cmd/'):
-            mode = self.path.split('/')[-1]  # Holt 'sleep', 'wake' oder 'auto'
-            _handle_sleep_command(self, mode)        
+        # Strip cache-busting query strings (e.g. /cmd/auto?t=123) once
+        path = self.path.partition('?')[0]
+        
+        # Route to handlers: /activate/{source}, /cmd/{mode}
+        head, sep, tail = path.lstrip('/').partition('/')
+        if sep:
+            arg_route = _GET_ARG_ROUTES.get(head)
+            if arg_route is not None:
+                arg_route(self, tail)  # tail: source name or 'sleep'/'wake'/'auto'
+                return
+        
+        route = _GET_ROUTES.get(path)
+        if route is not None:
+            route(self)
         else:
             # Unknown endpoint - delegate to parent
             return super().do_GET()
@@ -6041,11 +6920,12 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
             /artist_not_sure_action - Resolve artist-not-sure conflicts
         """
         if self.path == '/artist_not_sure_action':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+            post_data = _read_post_body(self)
+            if post_data is None:
+                return
             
             try:
-                request = json.loads(post_data.decode('utf-8'))
+                request = _json_loads(post_data)
                 action = request.get('action')
                 obs_title = request.get('observed_title')
                 obs_artist = request.get('observed_artist')
@@ -6053,8 +6933,7 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
                 kb_artist = request.get('kb_artist')
                 
                 # Validate action
-                allowed_actions = {"confirm", "deny", "allow_title_only"}
-                if action not in allowed_actions:
+                if action not in ARTIST_NOT_SURE_ACTIONS:
                     _send_json_response(
                         self, 400, False,
                         f"Invalid action: {action}"
@@ -6062,22 +6941,25 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
                     return
                 
                 # Validate parameters
-                if not all([obs_title, obs_artist, kb_title, kb_artist]):
-                    _send_json_response(
-                        self, 400, False,
-                        "Missing parameters"
-                    )
+                if not (obs_title and obs_artist and kb_title and kb_artist):
+                    _send_json_bytes(self, 400, _RESP_MISSING_PARAMS)
                     return
                 
                 # Process action
-                kb_path = SONGSDB_DIR / SONGS_KB_FILENAME
-                queue_path = SCRIPT_DIR / "missingsongs" / "artist_not_sure.jsonl"
-                reviewed_path = SCRIPT_DIR / "missingsongs" / "artist_not_sure.reviewed.jsonl"
-                
-                success = process_artist_not_sure_action(
+                fut = artist_not_sure_executor.submit(
+                    process_artist_not_sure_action,
                     action, obs_title, obs_artist, kb_title, kb_artist,
-                    kb_path, queue_path, reviewed_path
+                    SONGS_KB_PATH, ARTIST_NOT_SURE_QUEUE_PATH,
+                    ARTIST_NOT_SURE_REVIEWED_PATH
                 )
+                try:
+                    success = fut.result(timeout=ARTIST_NOT_SURE_TIMEOUT_S)
+                except FutureTimeoutError:
+                    _send_json_response(
+                        self, 504, False,
+                        "Action still running (timeout). Check the console."
+                    )
+                    return
                 
                 if success:
                     _send_json_response(
@@ -6091,16 +6973,41 @@ class MyHandler(http.server.SimpleHTTPRequestHandler):
                     )
             
             except json.JSONDecodeError:
-                _send_json_response(self, 400, False, "Invalid JSON")
+                _send_json_bytes(self, 400, _RESP_INVALID_JSON)
             
             except Exception as e:
                 _send_json_response(self, 500, False, str(e))
         
         else:
+            # Request body was not read - do not reuse the connection
             self.send_response(404)
+            self.send_header('Connection', 'close')
+            self.send_header('Content-Length', '0')
             self.end_headers()
 
 
+class FinjaHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    Threaded HTTP server for the local control panel.
+    
+    Allows fast restarts on the same port, does not block shutdown on
+    in-flight handler threads and uses a larger listen backlog so bursts
+    of panel polls are not dropped at accept().
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 128
+    
+    def server_bind(self):
+        """Enable SO_REUSEPORT where available (not on Windows) before binding."""
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass  # Kernel without SO_REUSEPORT support - plain bind still works
+        super().server_bind()
+
+
 # ##############################################################################
 #  MAIN PROGRAM
 # ##############################################################################
@@ -6112,17 +7019,43 @@ def acquire_lock():
     Returns:
         True if lock acquired successfully, False if already locked
     """
+    global lock_fd
+    
+    fd = os.open(str(LOCK_PATH), os.O_RDWR | os.O_CREAT, 0o644)
     try:
-        LOCK_PATH.touch(exist_ok=False)
-        return True
-    except FileExistsError:
-        log("ERROR: Lock file exists. Is the program already running?")
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        log("ERROR: Lock file is held. Is the program already running?")
         return False
+    
+    # PID for diagnostics only; the lock itself is the open descriptor
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode("ascii"))
+    lock_fd = fd
+    return True
 
 
 def release_lock():
-    """Remove program lock file."""
-    LOCK_PATH.unlink(missing_ok=True)
+    """Release program lock (the file stays; the OS drops the lock if we crash)."""
+    global lock_fd
+    
+    if lock_fd is None:
+        return
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            os.lseek(lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(lock_fd, msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    finally:
+        os.close(lock_fd)
+        lock_fd = None
 
 
 def main():
@@ -6140,15 +7073,27 @@ def main():
 # NOTE: HTTP is intentional for localhost-only control interface
 # This server is NOT exposed to the internet - it's bound to 127.0.0.1
 # Adding HTTPS would require certificates and provide no security benefit for local-only access
-        httpd = socketserver.TCPServer(("", PORT), MyHandler)
+        # Threaded: a slow POST (KB rewrite) or /run/* job no longer blocks panel polls
+        precompress_static_assets()
+        httpd = FinjaHTTPServer(("127.0.0.1", PORT), MyHandler)
+        
+        # Ctrl+C and SIGTERM (service manager / Docker) both stop serve_forever() cleanly.
+        # shutdown() blocks until the loop exits, so it must run off the main thread.
+        def _stop(_signum, _frame):
+            log("Shutting down...")
+            threading.Thread(target=httpd.shutdown, daemon=True).start()
+        
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+        
         log(f"Finja's BIG Musik BRAIN v1.1.0 is online! :3 | Control panel: http://localhost:{PORT}/Musik.html")  # NOSONAR - localhost only
         httpd.serve_forever()  # NOSONAR nosec B201 - localhost only, no external exposure
 
-    except KeyboardInterrupt:
-        log("Shutting down...")
     finally:
         if httpd:
             httpd.server_close()
+        artist_not_sure_executor.shutdown(wait=True)  # Let a pending KB rewrite finish
+        flush_reviewed_entries()
         stop_current_writer_and_nowplaying()  # Ensure all threads are stopped
         release_lock()
         log("Clean shutdown complete.")
@@ -43,15 +43,30 @@
 
 ======================================================================
 """
-import os, time, json, secrets, re, pickle, hashlib, threading
+import os, sys, time, json, math, secrets, re, hashlib, threading, functools, copy, atexit, bisect, itertools, asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 from datetime import datetime, timezone
 
-import requests
+import httpx
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+# Optional: orjson for faster KB/memory JSON (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: Aho-Corasick automaton for special-rule phrase matching
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Fallback: plain substring scan
+
 # --- Paths & Config ---
 SCRIPT_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = SCRIPT_DIR / "config_min.json"
@@ -64,6 +79,8 @@ GENRES_TXT   = OUTPUT_DIR / "spotify_genre.txt"
 
 # Legacy compatibility: optional double underscore
 REACTION_TXT_LEGACY = OUTPUT_DIR / "spotify__reaction.txt"
+# Mirror into the legacy file if it exists at startup (or force with "mirror_legacy_reaction")
+_LEGACY_ENABLED = bool(cfg.get("mirror_legacy_reaction", REACTION_TXT_LEGACY.exists()))
 
 # --- Utils ---
 DEBUG = bool(cfg.get("debug", True))
@@ -72,6 +89,54 @@ DEBUG = bool(cfg.get("debug", True))
 RE_NON_ALPHANUMERIC = r"[^\w\s]"
 RE_MULTI_SPACE = r"\s{2,}"
 
+# Precompiled once for the normalizers (hot path: every KB lookup)
+PAREN_RX = re.compile(r"[\(\[][^()\[\]]*[\)\]]")  # NOSONAR
+FEAT_RX = re.compile(r"\bfeat\.?\b|\bfeaturing\b")
+NON_ALNUM_RX = re.compile(RE_NON_ALPHANUMERIC)
+MULTI_SPACE_RX = re.compile(RE_MULTI_SPACE)
+WS_SPLIT_RX = re.compile(r"\s+")
+ARTIST_SPLIT_RX = re.compile(r"[,&;/]+")
+OTHER_WS_RX = re.compile(r"[^\S ]")  # any whitespace other than a plain space
+NORM_CACHE_SIZE = 8192  # memoized normalizers: the same titles/artists repeat every tick
+
+class _PunctToSpace(dict):
+    """str.translate table: chars NON_ALNUM_RX would replace map to " ".
+
+    Filled lazily per code point, so non-ASCII punctuation (e.g. ’ or …) stays
+    exactly as the regex treats it.
+    """
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        out = " " if NON_ALNUM_RX.match(ch) else ch
+        self[code] = out
+        return out
+
+PUNCT_TO_SPACE = _PunctToSpace()
+
+# bytes.translate table for the ASCII fast path: same mapping as PUNCT_TO_SPACE, for code points < 128
+_ASCII_PUNCT = bytes(c for c in range(128) if NON_ALNUM_RX.match(chr(c)))
+ASCII_PUNCT_TO_SPACE = bytes.maketrans(_ASCII_PUNCT, b" " * len(_ASCII_PUNCT))
+
+def _squash(s: str) -> str:
+    """Punctuation to spaces, then collapse/strip whitespace.
+
+    Printable ASCII (the usual Spotify title) has " " as its only whitespace,
+    so bytes.translate + split/join gives the exact regex result.
+    """
+    if s.isascii() and s.isprintable():
+        return " ".join(s.encode("ascii").translate(ASCII_PUNCT_TO_SPACE).decode("ascii").split())
+    return _collapse_ws(s.translate(PUNCT_TO_SPACE))
+
+def _collapse_ws(s: str) -> str:
+    """Same result as MULTI_SPACE_RX.sub(" ", s).strip(); split/join when " " is the only whitespace."""
+    if not OTHER_WS_RX.search(s):
+        return " ".join(s.split())
+    return MULTI_SPACE_RX.sub(" ", s).strip()
+
+# Deadlines, cooldowns and TTLs use the monotonic clock (immune to NTP/DST jumps);
+# wall-clock time is only for persisted timestamps (memory last_seen, updated_at)
+_now = time.monotonic
+
 def log(msg):
     """Prints a log message with timestamp."""
     print(time.strftime("[%Y-%m-%d %H:%M:%S]"), msg)
@@ -87,11 +152,35 @@ def atomic_write(path: Path, text: str):
     tmp.write_text(text, encoding="utf-8")  # NOSONAR
     tmp.replace(path)
 
+def atomic_write_bytes(path: Path, data: bytes):
+    """Writes bytes to a file atomically (write to temp, then rename)."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)  # NOSONAR
+    tmp.replace(path)
+
+def _json_loads(data):
+    """Parses JSON from str or bytes (orjson if installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, indent: bool = True) -> bytes:
+    """Serializes an object to UTF-8 JSON bytes (orjson if installed)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+# Last text published per output file (None = not written by this process yet)
+_last_out: Dict[str, Optional[str]] = {"reaction": None, "genres": None}
+_OUT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="out")
+
 def write_reaction(text: str):
     """Writes the reaction text to the output file(s)."""
     atomic_write(REACTION_TXT, text)
+    _last_out["reaction"] = text
     try:
-        if REACTION_TXT_LEGACY.exists():
+        if _LEGACY_ENABLED:
             atomic_write(REACTION_TXT_LEGACY, text)
     except Exception as e:
         log(f"[write_reaction] legacy write failed: {e}")
@@ -99,31 +188,60 @@ def write_reaction(text: str):
 def write_genres(text: str):
     """Writes the genre text to the output file."""
     atomic_write(GENRES_TXT, text)
+    _last_out["genres"] = text
+
+def write_outputs(reaction: str, genres: str):
+    """Publishes reaction + genres together; unchanged files are skipped, two changes are written in parallel."""
+    jobs = []
+    if reaction != _last_out["reaction"]:
+        jobs.append((write_reaction, reaction))
+    if genres != _last_out["genres"]:
+        jobs.append((write_genres, genres))
+    if len(jobs) == 2:
+        for f in [_OUT_POOL.submit(fn, text) for fn, text in jobs]:
+            f.result()
+    elif jobs:
+        fn, text = jobs[0]
+        fn(text)
 
 def read_json(path: Path, default):
     """Reads a JSON file safely, returning default on failure."""
     try:
-        return json.loads(path.read_text(encoding="utf-8"))  # NOSONAR
+        return _json_loads(path.read_bytes())  # NOSONAR
     except Exception:
         return default
 
 def write_json(path: Path, obj):
     """Writes an object as JSON to a file atomically."""
-    atomic_write(path, json.dumps(obj, ensure_ascii=False, indent=2))
+    atomic_write_bytes(path, _json_dumps(obj))
 
 # Optional nowplaying.txt fallback (not used for Spotify, but kept for stability)
 def read_file_stable(path: Path, settle_ms=cfg.get("sync_guard",{}).get("settle_ms",200), retries=cfg.get("sync_guard",{}).get("retries",3)):
-    last = None
+    """Reads the file once it is stable by (mtime, size) across one settle interval."""
+    def _stamp():
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    before = _stamp()
     for _ in range(max(1, retries)):
-        data = path.read_text(encoding="utf-8") if path.exists() else ""
-        if data == last: return data
-        last = data
+        if before is None:
+            return ""
         time.sleep(settle_ms/1000.0)
-    return last or ""
+        after = _stamp()
+        if after == before:
+            break
+        before = after
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return ""
 
 # --- KB / Index + Cache ---
 KB_JSON  = (SCRIPT_DIR / cfg.get("songs_kb_path", "SongsDB/songs_kb.json")).resolve()
-KB_CACHE = (SCRIPT_DIR / cfg.get("kb_index_cache_path", "cache/kb_index.pkl")).resolve()
+KB_CACHE = (SCRIPT_DIR / cfg.get("kb_index_cache_path", "cache/kb_index.json")).resolve()
 KB_CACHE.parent.mkdir(parents=True, exist_ok=True)
 
 RX_PATH  = (SCRIPT_DIR / cfg.get("reactions", {}).get("path", "Memory/reactions.json")).resolve()
@@ -137,50 +255,115 @@ for p in [RX_PATH, CTX_PATH, MEM_PATH]:
         p.write_text("{}", encoding="utf-8")
 
 DASH_SEPS = [" — ", " – ", " - ", " —", "–", "-"," by "]
+# (separator, artist-first?) decided once; " by " puts the title on the right
+_DASH_SEP_RULES = [(sep, sep.strip() == "by") for sep in DASH_SEPS]
+DASH_FALLBACK_RX = re.compile(r"^(.*)\s[—\-]\s(.*)$")  # NOSONAR
+# Cheap pre-filter: without any dash or " by " neither the separators nor the fallback can match
+DASH_PROBE_RX = re.compile(r"[—–-]| by ")
 
 def parse_title_artist(raw: str) -> Tuple[str,str]:
     """Splits a raw string into title and artist based on common separators."""
     s = (raw or "").strip()
-    for sep in DASH_SEPS:
+    if not DASH_PROBE_RX.search(s):
+        return "", s
+    # Separator priority (list order, not position) decides the split, so keep the ordered scan
+    for sep, swap in _DASH_SEP_RULES:
         if sep in s:
             left, right = [x.strip() for x in s.split(sep, 1)]
-            if sep.strip() == "by":
+            if swap:
                 return right, left
             return left, right
-    m = re.match(r"^(.*)\s[—\-]\s(.*)$", s)  # NOSONAR
+    m = DASH_FALLBACK_RX.match(s)
     if m:
         return m.group(1).strip(), m.group(2).strip()
     return "", s
 
+@functools.lru_cache(maxsize=NORM_CACHE_SIZE)
+def _kb_norm(s: str) -> str:
+    """Normalizes strings for comparison (lowercase, remove parens, etc.); memoized."""
+    s = s.lower().strip()
+    if "(" in s or "[" in s:
+        s = PAREN_RX.sub("", s)
+    s = s.replace("&","and")
+    if "feat" in s:
+        s = FEAT_RX.sub("", s)
+    return sys.intern(_squash(s))
+
 class KBIndex:
     """In-memory index for the Knowledge Base."""
     def __init__(self, entries: list):
         self.entries = entries
-        self.index = {"by_title": {}, "by_title_artist": {}}
+        self._set_index({}, {})
         for e in entries:
-            t = self._norm(e.get("title",""))
-            a = self._norm(e.get("artist",""))
-            if t:
-                self.index["by_title"].setdefault(t, []).append(e)
-            if t and a:
-                self.index["by_title_artist"][(t,a)] = e
-            
-            notes = self._parse_notes(e)
-            for aa in notes.get("artist_aliases", []):
-                aa = self._norm(aa)
-                if t and aa:
-                    self.index["by_title_artist"][(t,aa)] = e
+            t = _kb_norm(e.get("title",""))
+            a = _kb_norm(e.get("artist",""))
+            aliases = [_kb_norm(aa) for aa in self.notes_for(e).get("artist_aliases", [])]
+            self._add(e, t, a, aliases)
+
+    def _add(self, e: dict, t: str, a: str, aliases):
+        """Indexes one entry under its normalized keys (later entries win on key clashes)."""
+        e["_tn"], e["_an"] = t, a
+        if aliases:
+            e["_aliases"] = aliases
+        else:
+            e.pop("_aliases", None)  # stale from a rejected cache rebuild
+        if t:
+            self.by_title.setdefault(t, []).append(e)
+        if t and a:
+            self.by_title_artist[(t,a)] = e
+        for aa in aliases:
+            if t and aa:
+                self.by_title_artist[(t,aa)] = e
+
+    def _set_index(self, by_title: dict, by_title_artist: dict):
+        """Flat attributes for the hot path; `index` keeps the nested view for callers/tests."""
+        self.by_title = by_title
+        self.by_title_artist = by_title_artist
+        self.index = {"by_title": by_title, "by_title_artist": by_title_artist}
+
+    @staticmethod
+    def norm_keys(e: dict) -> Tuple[str, str]:
+        """Returns the entry's normalized (title, artist), kept on the entry as '_tn'/'_an'."""
+        t = e.get("_tn")
+        if t is None:
+            e["_an"] = _kb_norm(e.get("artist",""))  # set before _tn: readers key off _tn
+            t = e["_tn"] = _kb_norm(e.get("title",""))
+        return t, e["_an"]
+
+    def notes_for(self, e: dict) -> dict:
+        """Returns the entry's parsed notes, parsed once and kept on the entry as '_notes'."""
+        notes = e.get("_notes")
+        if notes is None:
+            notes = e["_notes"] = self._parse_notes(e)
+        return notes
 
     @staticmethod
     def _norm(s: str) -> str:
         """Normalizes strings for comparison (lowercase, remove parens, etc.)."""
-        s = s.lower().strip()
-        s = re.sub(r"[\(\[][^()\[\]]*[\)\]]","",s)  # NOSONAR
-        s = s.replace("&","and")
-        s = re.sub(r"\bfeat\.?\b|\bfeaturing\b","",s)
-        s = re.sub(RE_NON_ALPHANUMERIC, " ", s)
-        s = re.sub(RE_MULTI_SPACE," ",s)
-        return s.strip()
+        return _kb_norm(s)
+
+    @classmethod
+    def from_cache(cls, entries: list, cached: dict) -> "KBIndex":
+        """Rebuilds the index from the cached per-entry keys (no re-normalization)."""
+        keys = cached["keys"]
+        if len(keys) != len(entries):
+            raise ValueError("KB index cache does not match the KB entries")
+        idx = cls.__new__(cls)
+        idx.entries = entries
+        idx._set_index({}, {})
+        intern = sys.intern  # keys share storage with _kb_norm results, like a fresh build
+        for e, k in zip(entries, keys):
+            aliases = [intern(aa) for aa in k[2]] if len(k) > 2 else []
+            idx._add(e, intern(k[0]), intern(k[1]), aliases)
+        return idx
+
+    def to_cache(self) -> dict:
+        """Serializes the index compactly: [title, artist(, aliases)] per entry, in KB order."""
+        keys = []
+        for e in self.entries:
+            aliases = e.get("_aliases")
+            keys.append([e["_tn"], e["_an"], aliases] if aliases else [e["_tn"], e["_an"]])
+        return {"keys": keys}
 
     @staticmethod
     def _parse_notes(e: dict) -> dict:
@@ -191,7 +374,7 @@ class KBIndex:
         s = raw.strip()
         if s.startswith("{") and s.endswith("}"):
             try:
-                data = json.loads(s)
+                data = _json_loads(s)
                 out = {}
                 if isinstance(data.get("artist_aliases"), list):
                     out["artist_aliases"] = [str(x).strip() for x in data["artist_aliases"] if str(x).strip()]
@@ -205,23 +388,29 @@ class KBIndex:
                 return {}
         return {}
 
+KB_INDEX_CACHE_VERSION = 3
+
+def _kb_stat(path: Path) -> list:
+    """Cheap change marker for the KB file: [size, mtime_ns]."""
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
 def load_kb_index_with_cache(json_path: Path, cache_path: Path) -> KBIndex:
-    """Loads the Knowledge Base, using a pickle cache if available and valid."""
-    jhash = ""
-    try:
-        jhash = hashlib.sha256(json_path.read_bytes()).hexdigest()
-        if cache_path.exists():
-            obj = pickle.loads(cache_path.read_bytes())  # NOSONAR
-            if obj.get("json_hash") == jhash and isinstance(obj.get("index"), KBIndex):
-                return obj["index"]
-    except Exception as e:
-        log(f"[KB] cache probe failed: {e}")
+    """Loads the Knowledge Base; reuses the cached index keys if the KB is unchanged.
 
+    The cache is plain JSON (normalized keys per entry, in KB order), never pickle,
+    so it cannot execute code when loaded. Freshness is checked by (size, mtime)
+    first; the KB is only hashed (blake2b) when that does not match.
+    """
     entries = []
-    raw_bytes = b""
+    raw_bytes = None
+    stat_fp = None
     try:
+        before = _kb_stat(json_path)
         raw_bytes = json_path.read_bytes()
-        data = json.loads(raw_bytes.decode("utf-8"))
+        # Only trust (size, mtime) if the file did not change while it was read
+        stat_fp = before if _kb_stat(json_path) == before else None
+        data = _json_loads(raw_bytes)
         # Fixed SonarQube S3358: Refactored nested conditional expression
         if isinstance(data, dict) and "songs" in data:
             entries = data["songs"]
@@ -229,18 +418,46 @@ def load_kb_index_with_cache(json_path: Path, cache_path: Path) -> KBIndex:
             entries = data
         else:
             entries = []
-
-        if not jhash:
-            jhash = hashlib.sha256(raw_bytes).hexdigest()
     except Exception as e:
         log(f"[KB] load error: {e}")
         entries = []
+        raw_bytes = None
+
+    if raw_bytes is None:
+        return KBIndex(entries)
+
+    cached = None
+    try:
+        if cache_path.exists():
+            obj = _json_loads(cache_path.read_bytes())
+            if obj.get("version") == KB_INDEX_CACHE_VERSION:
+                cached = obj
+    except Exception as e:
+        log(f"[KB] cache probe failed: {e}")
+
+    fp = (cached or {}).get("json_fingerprint") or {}
+    if cached and stat_fp and fp.get("stat") == stat_fp:
+        try:
+            return KBIndex.from_cache(entries, cached)
+        except Exception as e:
+            log(f"[KB] cached index keys unusable, rebuilding: {e}")
+            cached = None  # same keys again on the hash path: don't retry
+
+    digest = hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+    idx = None
+    if cached and fp.get("blake2b") == digest:
+        # Touched but unchanged (e.g. copied): reuse the keys, refresh the stat part below
+        try:
+            idx = KBIndex.from_cache(entries, cached)
+        except Exception as e:
+            log(f"[KB] cached index keys unusable, rebuilding: {e}")
+    if idx is None:
+        idx = KBIndex(entries)
 
-    idx = KBIndex(entries)
     try:
-        payload = {"json_hash": jhash or "nohash", "index": idx}
+        payload = {"version": KB_INDEX_CACHE_VERSION, "json_fingerprint": {"stat": stat_fp, "blake2b": digest}, **idx.to_cache()}
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        atomic_write_bytes(cache_path, _json_dumps(payload, indent=False))
     except Exception as e:
         log(f"[KB] cache save failed: {e}")
 
@@ -251,44 +468,100 @@ SPECIAL_TAGS = cfg.get("special_version_tags", {})  # e.g. {"nightcore":[...], "
 
 def _ws_pat(s: str) -> str:
     """Creates a regex pattern for whitespace-tolerant matching."""
-    parts = [p for p in re.split(r"\s+", (s or "").strip().lower()) if p]
+    parts = [p for p in WS_SPLIT_RX.split((s or "").strip().lower()) if p]
     if not parts:
         return ""
     return r"[\s\-]*".join(re.escape(p) for p in parts)  # NOSONAR
 
+# One compiled alternation per label, rebuilt only if SPECIAL_TAGS is swapped out
+_SPECIAL_TAG_SRC = None
+_SPECIAL_TAG_RX: list = []
+
+def _special_tag_patterns() -> list:
+    """Returns [(label, compiled alternation)] for SPECIAL_TAGS, in config order."""
+    global _SPECIAL_TAG_SRC, _SPECIAL_TAG_RX
+    if _SPECIAL_TAG_SRC is not SPECIAL_TAGS:
+        compiled = []
+        for label, variants in SPECIAL_TAGS.items():
+            pats = [p for p in (_ws_pat(v) for v in variants or []) if p]
+            if pats:
+                compiled.append((label, re.compile("|".join(pats))))
+        _SPECIAL_TAG_RX, _SPECIAL_TAG_SRC = compiled, SPECIAL_TAGS
+    return _SPECIAL_TAG_RX
+
 def detect_special_version_tags(title: str) -> Optional[str]:
     """Detects tags like Nightcore or Speed Up in the title."""
     low = (title or "").lower()
-    for label, variants in SPECIAL_TAGS.items():
-        for v in variants or []:
-            pat = _ws_pat(v)
-            if pat and re.search(pat, low):
-                return label
+    for label, rx in _special_tag_patterns():
+        if rx.search(low):
+            return label
     return None
 
 # --- Memory (simple JSON), Decay, Tails ---
 MEM_CFG = cfg.get("memory", {})
-def load_mem(): return read_json(MEM_PATH, {})
-def save_mem(d): write_json(MEM_PATH, d)
+MEM_FLUSH_INTERVAL_S = float(MEM_CFG.get("flush_interval_s", 15))
+MEM_FLUSH_EVERY_N = int(MEM_CFG.get("flush_every_n", 20))
+
+# Memory stays resident; save_mem only marks it dirty and mem_flush_loop persists it
+_MEM = read_json(MEM_PATH, {})
+_MEM_LOCK = threading.RLock()
+_MEM_DIRTY = False
+_MEM_PENDING = 0
+
+def load_mem(): return _MEM
+
+def save_mem(d):
+    """Marks memory as changed; written by the flusher, or right away after MEM_FLUSH_EVERY_N updates."""
+    global _MEM, _MEM_DIRTY, _MEM_PENDING
+    with _MEM_LOCK:
+        _MEM = d
+        _MEM_DIRTY = True
+        _MEM_PENDING += 1
+        if MEM_FLUSH_EVERY_N > 0 and _MEM_PENDING >= MEM_FLUSH_EVERY_N:
+            flush_mem()
+
+def flush_mem():
+    """Writes memory.json if it changed since the last flush."""
+    global _MEM_DIRTY, _MEM_PENDING
+    with _MEM_LOCK:
+        if not _MEM_DIRTY:
+            return
+        write_json(MEM_PATH, _MEM)
+        _MEM_DIRTY = False
+        _MEM_PENDING = 0
+
+def mem_flush_loop():
+    """Background loop: persist memory at most every MEM_FLUSH_INTERVAL_S."""
+    while True:
+        time.sleep(MEM_FLUSH_INTERVAL_S)
+        try:
+            flush_mem()
+        except Exception as e:
+            log(f"[memory] flush failed: {e}")
+
+atexit.register(flush_mem)
 
 def apply_decay(entry: dict):
     """Applies time-based score decay to memory entries."""
-    if not MEM_CFG.get("decay",{}).get("enabled", False):
+    decay_cfg = MEM_CFG.get("decay",{})
+    if not decay_cfg.get("enabled", False):
         return
     now = time.time()
-    hl = MEM_CFG["decay"].get("half_life_days", 90)
-    floor = MEM_CFG["decay"].get("floor", 0.0)
+    # 0.5 ** (dt / half_life) == exp(dt * k): one multiply + exp per context
+    k = -math.log(2) / (decay_cfg.get("half_life_days", 90) * 24*3600)
+    floor = decay_cfg.get("floor", 0.0)
     for ctxd in entry.get("contexts", {}).values():
         ls = ctxd.get("last_seen", 0)
         if not ls: continue
-        days = (now - ls)/(24*3600)
-        factor = 0.5 ** (days/hl)
-        ctxd["score"] = max(ctxd.get("score",0.0)*factor, floor)
+        score = ctxd.get("score", 0.0)
+        if score == floor and floor >= 0 and "score" in ctxd:
+            continue  # already resting on a non-negative floor; decay cannot move it
+        ctxd["score"] = max(score * math.exp((now - ls) * k), floor)
 
 def _resolve_cross_context_tail(contexts: dict, current_ctx: str, tier: str, t: dict, v: dict) -> str:
     """Helper to resolve cross-context tail logic (reduces complexity of memory_tail)."""
-    sorted_ctx = sorted(contexts.items(), key=lambda kv: kv[1].get("score", -999), reverse=True)
-    best_ctx, best_data = sorted_ctx[0]
+    # Only the top context is needed; max keeps the first one on ties, like the stable sort did
+    best_ctx, best_data = max(contexts.items(), key=lambda kv: kv[1].get("score", -999))
     margin = t.get("confidence_margin", 0.75)
     current_score = contexts.get(current_ctx, {}).get("score", -999)
 
@@ -326,14 +599,53 @@ def memory_tail(entry, current_ctx, tier) -> str:
 
 # --- Reactions + Bias + Specials ---
 REACTIONS = read_json(RX_PATH, {})
-THRESH = REACTIONS.get("thresholds", {"love":9,"like":3,"dislike":-3,"hate":-9})
+_RX_MTIME = RX_PATH.stat().st_mtime_ns
+RX_RELOAD_CHECK_S = float(cfg.get("reactions", {}).get("reload_check_s", 5.0))
+_RX_CHECKED_AT = _now()
+
+def get_reactions() -> dict:
+    """Returns reactions.json; stats it at most every RX_RELOAD_CHECK_S and re-reads only on an mtime change."""
+    global REACTIONS, _RX_MTIME, _RX_CHECKED_AT
+    now = _now()
+    if now - _RX_CHECKED_AT < RX_RELOAD_CHECK_S:
+        return REACTIONS
+    _RX_CHECKED_AT = now
+    try:
+        m = RX_PATH.stat().st_mtime_ns
+    except OSError:
+        return REACTIONS
+    if m != _RX_MTIME:
+        data = read_json(RX_PATH, None)
+        if isinstance(data, dict):  # keep the last good copy on a half-written file
+            REACTIONS = data
+        _RX_MTIME = m
+    return REACTIONS
+
+# Tier thresholds as plain floats (tier_from_score runs twice per reaction),
+# re-read only when get_reactions swapped REACTIONS
+_THRESH_SRC = None
+THRESH: dict = {}
+T_LOVE = T_LIKE = T_DISLIKE = T_HATE = 0.0
+
+def thresholds() -> Tuple[float, float, float, float]:
+    """Returns (love, like, dislike, hate), rebuilding them only when REACTIONS changed."""
+    global _THRESH_SRC, THRESH, T_LOVE, T_LIKE, T_DISLIKE, T_HATE
+    if _THRESH_SRC is not REACTIONS:
+        THRESH = REACTIONS.get("thresholds", {"love":9,"like":3,"dislike":-3,"hate":-9})
+        T_LOVE, T_LIKE = float(THRESH.get("love",9)), float(THRESH.get("like",3))
+        T_DISLIKE, T_HATE = float(THRESH.get("dislike",-3)), float(THRESH.get("hate",-9))
+        _THRESH_SRC = REACTIONS
+    return T_LOVE, T_LIKE, T_DISLIKE, T_HATE
+
+thresholds()
 
 def tier_from_score(s: float) -> str:
     """Converts a numerical score to a tier (love, like, neutral, etc.)."""
-    if s >= THRESH.get("love",9): return "love"
-    if s >= THRESH.get("like",3): return "like"
-    if s >  THRESH.get("dislike",-3): return "neutral"
-    if s >  THRESH.get("hate",-9): return "dislike"
+    t_love, t_like, t_dislike, t_hate = thresholds()
+    if s >= t_love: return "love"
+    if s >= t_like: return "like"
+    if s >  t_dislike: return "neutral"
+    if s >  t_hate: return "dislike"
     return "hate"
 
 def reaction_from_tier(tier: str) -> str:
@@ -343,65 +655,184 @@ def reaction_from_tier(tier: str) -> str:
         return secrets.choice(sets)
     return REACTIONS.get("fallback", {}).get(tier, "...")
 
-ARTIST_PREFS = REACTIONS.get("artist_preferences", {})  # score_bias + optional flip map per tier
+# artist_preferences (score_bias + optional flip map per tier), keyed by _kb_norm(name)
+_ARTIST_PREFS_SRC = None
+_ARTIST_PREFS_NORM: Dict[str, dict] = {}
+FLIP_TO = {"dislike":"neutral","neutral":"like","like":"neutral"}
+
+def artist_prefs() -> Dict[str, dict]:
+    """Returns the normalized artist preferences, rebuilding them only when REACTIONS changed."""
+    global _ARTIST_PREFS_SRC, _ARTIST_PREFS_NORM
+    if _ARTIST_PREFS_SRC is not REACTIONS:
+        _ARTIST_PREFS_NORM = {_kb_norm(k): v for k, v in REACTIONS.get("artist_preferences", {}).items()}
+        _ARTIST_PREFS_SRC = REACTIONS
+    return _ARTIST_PREFS_NORM
 
 def apply_artist_flip(tier: str, artists_norm: list) -> str:
     """Applies artist-specific tier flips (e.g. force dislike to neutral)."""
+    prefs = artist_prefs()
     for a in artists_norm:
-        flip = ARTIST_PREFS.get(a, {}).get("flip", {})
-        if tier in flip and secrets.SystemRandom().random() < float(flip[tier]):  # NOSONAR - CSPRNG
-            return {"dislike":"neutral","neutral":"like","like":"neutral"}.get(tier, tier)
+        flip = prefs.get(a, {}).get("flip", {})
+        if tier in flip and _RNG.random() < float(flip[tier]):
+            return FLIP_TO.get(tier, tier)
     return tier
 
 # helper: robust normalize (for Bias & Specials)
+@functools.lru_cache(maxsize=NORM_CACHE_SIZE)
 def _norm_txt(s: str) -> str:
-    s = (s or "").lower().strip()
-    s = s.replace("&","and")
-    s = re.sub(RE_NON_ALPHANUMERIC, " ", s)  # NOSONAR
-    s = re.sub(RE_MULTI_SPACE, " ", s)  # NOSONAR
-    return s.strip()
-
-# Specials from reactions.json
-SPECIAL_RULES = REACTIONS.get("special", [])
+    return sys.intern(_squash((s or "").lower().strip().replace("&","and")))
+
+# Global like/dislike lists, normalized once per loaded reactions.json (get_reactions may swap it)
+BIAS_KEYS = ("like_tags", "dislike_tags", "like_artists", "dislike_artists")
+_BIAS_SRC = None
+_BIAS: Dict[str, set] = {}
+
+def bias_tables() -> Dict[str, set]:
+    """Returns the normalized bias sets, rebuilding them only when REACTIONS changed."""
+    global _BIAS_SRC, _BIAS
+    if _BIAS_SRC is not REACTIONS:
+        bias_cfg = REACTIONS.get("bias", {})
+        _BIAS = {k: {_norm_txt(x) for x in bias_cfg.get(k, [])} for k in BIAS_KEYS}
+        _BIAS_SRC = REACTIONS
+    return _BIAS
+
+# Specials from reactions.json (REACTIONS["special"]), preprocessed by special_tables()
+def _preprocess_special_rules(rules: list) -> list:
+    """Normalizes each rule's title/artist phrases once, at load."""
+    return [
+        {
+            "titles": [_norm_txt(x) for x in r.get("title_contains", []) if str(x).strip()],
+            "arts":   [_norm_txt(x) for x in r.get("artist_contains", []) if str(x).strip()],
+            "force":  r.get("force_bucket"),
+            "react":  r.get("react"),
+        }
+        for r in rules
+    ]
+
+def _build_special_automaton(rules_pre: list):
+    """Builds one Aho-Corasick automaton over every special-rule phrase (None if unavailable)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rule in rules_pre:
+        for phrase in rule["titles"] + rule["arts"]:
+            if phrase:
+                automaton.add_word(phrase, phrase)
+    if not len(automaton):
+        return None
+    automaton.make_automaton()
+    return automaton
+
+def _index_special_rules(rules_pre: list) -> Tuple[Dict[str, List[int]], List[int]]:
+    """Groups rule indexes by a pivot phrase that must be hit for the rule to match.
+
+    The pivot is the longest title phrase (all of them are required); rules
+    without one are filed under each artist phrase (any of them suffices).
+    Rules that can match without any hit go to the always-checked list.
+    """
+    by_pivot: Dict[str, List[int]] = {}
+    always: List[int] = []
+    for i, rule in enumerate(rules_pre):
+        titles = [x for x in rule["titles"] if x]
+        if titles:
+            pivots = [max(titles, key=len)]
+        elif rule["arts"] and all(rule["arts"]):
+            pivots = rule["arts"]
+        else:
+            always.append(i)
+            continue
+        for p in dict.fromkeys(pivots):
+            by_pivot.setdefault(p, []).append(i)
+    return by_pivot, always
+
+# (rules_pre, automaton, by_pivot, always, phrases) for the REACTIONS they were built from
+_SPECIAL_SRC = None
+_SPECIAL: tuple = ()
+
+def special_tables() -> tuple:
+    """Returns the preprocessed special rules and their indexes, rebuilding them only when REACTIONS changed."""
+    global _SPECIAL_SRC, _SPECIAL
+    if _SPECIAL_SRC is not REACTIONS:
+        rules_pre = _preprocess_special_rules(REACTIONS.get("special", []))
+        by_pivot, always = _index_special_rules(rules_pre)
+        phrases = tuple(dict.fromkeys(p for r in rules_pre for p in r["titles"] + r["arts"] if p))
+        _SPECIAL = (rules_pre, _build_special_automaton(rules_pre), by_pivot, always, phrases)
+        _SPECIAL_SRC = REACTIONS
+    return _SPECIAL
+
+special_tables()
+
+def _special_phrase_hits(text: str, automaton, phrases: tuple) -> set:
+    """Returns every special-rule phrase contained in text (one automaton pass if available)."""
+    if automaton is None:
+        return {p for p in phrases if p in text}
+    return {phrase for _, phrase in automaton.iter(text)}
 
 def match_special(title: str, artists_csv: str):
     """Return (forced_tier or None, custom_react or None) if any special rule matches."""
     tnorm = _norm_txt(title)
     anorm = _norm_txt(artists_csv)
     # Check individual artists
-    artist_list = [a.strip() for a in re.split(r"[,&;/]+", artists_csv or "") if a.strip()]
+    artist_list = [a.strip() for a in ARTIST_SPLIT_RX.split(artists_csv or "") if a.strip()]
     artist_list_norm = [_norm_txt(a) for a in artist_list]
 
-    for rule in SPECIAL_RULES:
-        titles = [_norm_txt(x) for x in rule.get("title_contains", []) if str(x).strip()]
-        arts   = [_norm_txt(x) for x in rule.get("artist_contains", []) if str(x).strip()]
-        
-        cond_t = all((x in tnorm) for x in titles) if titles else True
-        cond_a = True
-        if arts:
-            # Match if any artist token contains the requirement
-            cond_a = any((x in anorm) or any(x in a for a in artist_list_norm) for x in arts)
-            
+    rules_pre, automaton, by_pivot, always, phrases = special_tables()
+    t_hits = _special_phrase_hits(tnorm, automaton, phrases)
+    a_hits = _special_phrase_hits(anorm, automaton, phrases)
+    for a in artist_list_norm:
+        a_hits |= _special_phrase_hits(a, automaton, phrases)
+
+    # Only rules whose pivot phrase was hit can match; keep config order (first match wins)
+    candidates = set(always)
+    for phrase in t_hits | a_hits:
+        candidates.update(by_pivot.get(phrase, ()))
+
+    for i in sorted(candidates):
+        rule = rules_pre[i]
+        # Empty phrases (punctuation-only entries) match everything, as with `in`
+        cond_t = all((not x) or (x in t_hits) for x in rule["titles"])
+        arts = rule["arts"]
+        cond_a = (not arts) or any((not x) or (x in a_hits) for x in arts)
         if cond_t and cond_a:
-            forced = rule.get("force_bucket")
-            react  = rule.get("react")
-            return forced, react
+            return rule["force"], rule["react"]
     return None, None
 
 # --- Context ---
 CONTEXTS = read_json(CTX_PATH, {"default_profile":"neutral","profiles":{"neutral":{"bucket_bias":{},"tag_weights":{},"artist_weights":{}}}})
 
+# game_state.txt is re-read only when its mtime changes: ((path, mtime_ns or None), mapped context)
+_CTX_CACHE: Tuple[Optional[tuple], Optional[str]] = (None, None)
+
+@functools.lru_cache(maxsize=8)
+def _ctx_file_path(rel: str) -> Path:
+    """Resolves the game-state path once (resolve() walks every path component)."""
+    return (SCRIPT_DIR / rel).resolve()
+
+def _context_from_file(source: dict) -> str:
+    """Maps the game-state file's content to a context name, cached on the file's mtime."""
+    global _CTX_CACHE
+    p = _ctx_file_path(source.get("path","Memory/game_state.txt"))
+    try:
+        stamp = (p, p.stat().st_mtime_ns)
+    except OSError:
+        stamp = (p, None)
+    cached_stamp, cached_val = _CTX_CACHE
+    if stamp == cached_stamp:
+        return cached_val
+    try:
+        current = p.read_text(encoding="utf-8").strip().lower() if stamp[1] is not None else ""
+    except Exception:
+        current = ""
+    current = source.get("map",{}).get(current, CONTEXTS.get("default_profile","neutral"))
+    _CTX_CACHE = (stamp, current)  # one assignment, so readers never see a mixed pair
+    return current
+
 def active_context() -> Tuple[str, dict]:
     """Determines the current active context (e.g., from game_state.txt)."""
     source = CONTEXTS.get("source", {})
     current=""
     if source.get("type")=="file":
-        p = (SCRIPT_DIR / source.get("path","Memory/game_state.txt")).resolve()
-        try:
-            current = p.read_text(encoding="utf-8").strip().lower() if p.exists() else ""
-        except Exception:
-            current = ""
-        current = source.get("map",{}).get(current, CONTEXTS.get("default_profile","neutral"))
+        current = _context_from_file(source)
     else:
         current = CONTEXTS.get("default_profile","neutral")
     prof = CONTEXTS.get("profiles", {}).get(current, CONTEXTS["profiles"]["neutral"])
@@ -411,21 +842,27 @@ def active_context() -> Tuple[str, dict]:
 class LRUCacheTTL:
     def __init__(self, maxsize=256, ttl=60):
         self.maxsize, self.ttl = maxsize, ttl
-        self.data: Dict[tuple, tuple] = {}  # key -> (value, expire_ts)
+        self.data: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (value, expire_ts), oldest-used first
+        self._lock = threading.Lock()
     
     def get(self, key):
-        v = self.data.get(key)
-        if not v: return None
-        val, exp = v
-        if time.time()>exp:
-            self.data.pop(key, None)
-            return None
-        return val
+        with self._lock:
+            v = self.data.get(key)
+            if not v: return None
+            val, exp = v
+            if _now()>exp:
+                self.data.pop(key, None)
+                return None
+            self.data.move_to_end(key)
+            return val
     
     def set(self, key, value):
-        if len(self.data)>=self.maxsize:
-            self.data.pop(next(iter(self.data)))
-        self.data[key]=(value, time.time()+self.ttl)
+        with self._lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+            elif len(self.data)>=self.maxsize:
+                self.data.popitem(last=False)
+            self.data[key]=(value, _now()+self.ttl)
 
 RESULT_CACHE = LRUCacheTTL(maxsize=512, ttl=90)
 
@@ -434,20 +871,21 @@ KB = load_kb_index_with_cache(KB_JSON, KB_CACHE)
 
 def get_genres_from_entry(e: dict) -> str:
     tags = list(e.get("tags", []))
-    notes = KB._parse_notes(e)
+    notes = KB.notes_for(e)
     tags += notes.get("add_tags", [])
     return ", ".join(sorted(set(tags))) or "Unknown"
 
 def find_kb_entry(title:str, artist_csv:str) -> Optional[dict]:
-    t = KB._norm(title)
-    a = KB._norm(artist_csv)
-    if (t,a) in KB.index["by_title_artist"]: return KB.index["by_title_artist"][(t,a)]
+    t = _kb_norm(title)
+    a = _kb_norm(artist_csv)
+    hit = KB.by_title_artist.get((t,a))
+    if hit is not None: return hit
     
-    cands = KB.index["by_title"].get(t, [])
+    cands = KB.by_title.get(t, [])
     if len(cands)==1: return cands[0]
     if len(cands)>1:
         first = cands[0]
-        notes = KB._parse_notes(first)
+        notes = KB.notes_for(first)
         if notes.get("allow_title_only", False) and len(cands)<=notes.get("max_ambiguous_candidates",1):
             return first
     return None
@@ -460,45 +898,88 @@ ACCESS_TOKEN = ""
 ACCESS_TOKEN_TS = 0
 TOKEN_REFRESH_INTERVAL_S = int(cfg.get("token_refresh_interval_s", 25*60))
 
-def refresh_token():
+# One pooled keep-alive async client, created on app startup (see lifespan)
+HTTP: Optional[httpx.AsyncClient] = None
+
+# Fail fast on connect (3 s), allow slower reads (10 s); small keep-alive pool, gzip bodies
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+HTTP_LIMITS = httpx.Limits(max_connections=4, max_keepalive_connections=2)
+HTTP_HEADERS = {"Accept-Encoding": "gzip"}
+
+def _make_http_client() -> httpx.AsyncClient:
+    """Creates the shared Spotify client; HTTP/2 when the optional h2 package is installed."""
+    opts = {"timeout": HTTP_TIMEOUT, "limits": HTTP_LIMITS, "headers": HTTP_HEADERS}
+    try:
+        return httpx.AsyncClient(http2=True, **opts)
+    except ImportError:
+        return httpx.AsyncClient(**opts)
+
+async def refresh_token():
     """Refreshes the Spotify OAuth token."""
     global ACCESS_TOKEN, ACCESS_TOKEN_TS
     url = 'https://accounts.spotify.com/api/token'
     try:
-        r = requests.post(
+        r = await HTTP.post(
             url,
             data={'grant_type': 'refresh_token', 'refresh_token': SPOTIFY_REFRESH_TOKEN},
             auth=(SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET),
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
-            timeout=10
         )
         if r.status_code != 200:
             log(f"[spotify] refresh error {r.status_code}: {r.text}")
             r.raise_for_status()
         payload = r.json()
         ACCESS_TOKEN = payload['access_token']
-        ACCESS_TOKEN_TS = time.time()
+        ACCESS_TOKEN_TS = _now()
         log("[spotify] token refreshed")
     except Exception as e:
         log(f"[spotify] refresh exception: {e}")
         raise
 
-def spotify_nowplaying() -> Tuple[str,str]:
+# Conditional GET state: last ETag + parsed result, a 429 back-off deadline and
+# when the current track should end (monotonic; 0.0 = unknown / not playing)
+_NP_STATE = {"etag": None, "result": ("", ""), "backoff_until": 0.0, "ends_at": 0.0}
+
+async def spotify_nowplaying() -> Tuple[str,str]:
     """Fetches the currently playing song from Spotify."""
-    if not ACCESS_TOKEN or time.time()-ACCESS_TOKEN_TS>TOKEN_REFRESH_INTERVAL_S:
-        refresh_token()
-    r = requests.get('https://api.spotify.com/v1/me/player/currently-playing',
-                     headers={'Authorization': f'Bearer {ACCESS_TOKEN}'}, timeout=10)
-    if r.status_code==204: return "",""
+    if _now() < _NP_STATE["backoff_until"]:
+        return _NP_STATE["result"]  # rate-limited: keep the last known song, no request
+    if not ACCESS_TOKEN or _now()-ACCESS_TOKEN_TS>TOKEN_REFRESH_INTERVAL_S:
+        await refresh_token()
+    headers = {'Authorization': f'Bearer {ACCESS_TOKEN}'}
+    if _NP_STATE["etag"]:
+        headers['If-None-Match'] = _NP_STATE["etag"]
+    r = await HTTP.get('https://api.spotify.com/v1/me/player/currently-playing', headers=headers)
+    if r.status_code==304: return _NP_STATE["result"]
+    if r.status_code==429:
+        try:
+            retry_after = float(r.headers.get("Retry-After", INTERVAL_S))
+        except ValueError:
+            retry_after = float(INTERVAL_S)
+        retry_after = min(max(retry_after, 0.0), POLL_MAX_S * 10)  # don't let a bogus header stall polling for hours
+        _NP_STATE["backoff_until"] = _now() + retry_after
+        log(f"[spotify] rate limited, backing off {retry_after:.0f}s")
+        return _NP_STATE["result"]
+    if r.status_code==204:
+        _NP_STATE["etag"], _NP_STATE["result"], _NP_STATE["ends_at"] = None, ("", ""), 0.0
+        return "",""
     r.raise_for_status()
     data = r.json()
     item = data.get("item") or {}
     title = item.get("name","")
     artists = ", ".join([a.get("name","") for a in item.get("artists",[])])
+    remaining_ms = (item.get("duration_ms") or 0) - (data.get("progress_ms") or 0)
+    ends_at = _now() + remaining_ms / 1000.0 if data.get("is_playing") and remaining_ms > 0 else 0.0
+    _NP_STATE["etag"], _NP_STATE["result"], _NP_STATE["ends_at"] = r.headers.get("ETag"), (title, artists), ends_at
     return title, artists
 
 # --- Listening Phase State ---
 INTERVAL_S = int(cfg.get("interval_s", 5))
+# Adaptive polling: INTERVAL_S while a reaction is pending, then POLL_SLOW_S growing
+# towards POLL_MAX_S while the same track keeps playing, but never past its expected end
+POLL_SLOW_S = float(cfg.get("poll_slow_s", 30))
+POLL_MAX_S = float(cfg.get("poll_max_s", 60))
+POLL_STABLE_STEP = 5  # unchanged polls per POLL_SLOW_S increment
 DEFAULT_LISTENING_TEXT = "Listening…"  # S1192: Defined constant
 LISTEN_CFG = cfg.get("reactions", {}).get("listening", {
     "enabled": True,
@@ -514,13 +995,30 @@ last_key = None
 last_song_log_ts = 0.0
 last_written = None  # Mini-Patch: Write/Log only on change
 current_output = {"reaction":"","genres":"","title":"","artist":"","context":"","updated_at":""}
+prefetched = None  # (kb_entry, special_version) looked up once per new song
+
+# Weighted tier picks: cumulative tables are built once per distinct weight set
+TIER_POP = ("like", "neutral", "dislike")
+_RNG = secrets.SystemRandom()  # NOSONAR - CSPRNG
+
+@functools.lru_cache(maxsize=32)
+def _cum_weights(weights: tuple) -> tuple:
+    """Returns the cumulative weight table for a weight tuple."""
+    cum = tuple(itertools.accumulate(float(w) for w in weights))
+    if not cum or cum[-1] <= 0:
+        raise ValueError("Total of weights must be greater than zero")
+    return cum
+
+def _pick_weighted(pop: tuple, weights: tuple):
+    """Same draw as random.choices(pop, weights)[0], without rebuilding the cumulative list."""
+    cum = _cum_weights(weights)
+    return pop[bisect.bisect(cum, _RNG.random() * cum[-1], 0, len(cum) - 1)]
 
 def _handle_unknown_policy(rx_cfg: dict, special_version: Optional[str], config: dict) -> Tuple[str, str]:
     """Helper: Handles logic when no KB entry is found (Unknown Policy)."""
     pol = rx_cfg.get("unknown_policy", {"enabled": True, "like": 0.35, "neutral": 0.40, "dislike": 0.25})
     if pol.get("enabled", True):
-        bucket = secrets.SystemRandom().choices(["like", "neutral", "dislike"],  # NOSONAR - CSPRNG
-                              weights=[pol["like"], pol["neutral"], pol["dislike"]], k=1)[0]
+        bucket = _pick_weighted(TIER_POP, (pol["like"], pol["neutral"], pol["dislike"]))
     else:
         bucket = "neutral"
         
@@ -544,11 +1042,12 @@ def _calculate_dynamic_tier(ctx: str, ment: dict, profile: dict, kb_entry: Optio
     
     # 1. Artist Bias
     artist_weights = profile.get("artist_weights", {})
+    prefs = artist_prefs()
     artist_biases = []
     for a in all_artists:
-        na = KB._norm(a)
+        na = _kb_norm(a)
         bias_ctx  = artist_weights.get(na, 0.0)
-        bias_pref = ARTIST_PREFS.get(na, {}).get("score_bias", 0.0)
+        bias_pref = prefs.get(na, {}).get("score_bias", 0.0)
         artist_biases.append(bias_ctx + bias_pref)
     artist_bias = max(artist_biases) if artist_biases else 0.0
 
@@ -557,29 +1056,22 @@ def _calculate_dynamic_tier(ctx: str, ment: dict, profile: dict, kb_entry: Optio
     tag_bias = sum(profile.get("tag_weights", {}).get(t, 0.0) for t in tags)
 
     # 3. Global Bias Config (Like/Dislike lists)
-    bias_cfg = REACTIONS.get("bias", {})
-    def _norm(s):
-        s = s.lower().strip()
-        s = s.replace("&","and")
-        s = re.sub(RE_NON_ALPHANUMERIC, " ", s)  # NOSONAR
-        s = re.sub(RE_MULTI_SPACE, " ", s)  # NOSONAR
-        return s.strip()
-
-    like_tags      = { _norm(x) for x in bias_cfg.get("like_tags", []) }
-    dislike_tags   = { _norm(x) for x in bias_cfg.get("dislike_tags", []) }
-    like_artists   = { _norm(x) for x in bias_cfg.get("like_artists", []) }
-    dislike_artists= { _norm(x) for x in bias_cfg.get("dislike_artists", []) }
+    bias = bias_tables()
+    like_tags       = bias["like_tags"]
+    dislike_tags    = bias["dislike_tags"]
+    like_artists    = bias["like_artists"]
+    dislike_artists = bias["dislike_artists"]
 
     bias_bonus_tags = 0.0
     if tags:
-        lowtags = { _norm(t) for t in tags }
+        lowtags = { _norm_txt(t) for t in tags }
         if lowtags & like_tags:    bias_bonus_tags += 0.5
         if lowtags & dislike_tags: bias_bonus_tags -= 0.5
 
-    arts_norm = [ _norm(a) for a in all_artists ]
+    arts_norm = { _norm_txt(a) for a in all_artists }
     bias_bonus_art = 0.0
-    if any(a in like_artists for a in arts_norm):     bias_bonus_art += 1.0
-    if any(a in dislike_artists for a in arts_norm):  bias_bonus_art -= 1.0
+    if arts_norm & like_artists:     bias_bonus_art += 1.0
+    if arts_norm & dislike_artists:  bias_bonus_art -= 1.0
 
     extra_bias = bias_bonus_tags + bias_bonus_art
 
@@ -597,12 +1089,11 @@ def _calculate_dynamic_tier(ctx: str, ment: dict, profile: dict, kb_entry: Optio
         chance = float(expl.get("chance", 0.0))
         if secrets.SystemRandom().random() < chance:  # NOSONAR - CSPRNG
             w = expl.get("weights", {"like":0.45, "neutral":0.35, "dislike":0.20})
-            tier = secrets.SystemRandom().choices(["like","neutral","dislike"],  # NOSONAR - CSPRNG
-                                  weights=[w.get("like",0), w.get("neutral",0), w.get("dislike",0)], k=1)[0]
+            tier = _pick_weighted(TIER_POP, (w.get("like",0), w.get("neutral",0), w.get("dislike",0)))
 
     # 6. Probabilistic Flip
     tier_before_flip = tier
-    tier = apply_artist_flip(tier, [KB._norm(a) for a in all_artists])
+    tier = apply_artist_flip(tier, [_kb_norm(a) for a in all_artists])
 
     # Debug / Sanity
     dbg(
@@ -644,8 +1135,11 @@ def _update_memory_score(ment: dict, ctx: str, tier: str):
         
     c["score"] = max(-10.0, min(10.0, c.get("score", 0.0) + score_delta))
 
-def compute_reaction(title:str, artists:str) -> Tuple[str,str]:
-    """Core logic to determine reaction and genre for a song."""
+def compute_reaction(title:str, artists:str, prefetched: Optional[Tuple[Optional[dict], Optional[str]]] = None) -> Tuple[str,str]:
+    """Core logic to determine reaction and genre for a song.
+
+    prefetched: optional (kb_entry, special_version) already looked up for this song.
+    """
     # Refactored for S3776: Reduced complexity by extracting sub-logic
     ctx, profile = active_context()
     key = (title, artists, ctx)
@@ -654,12 +1148,15 @@ def compute_reaction(title:str, artists:str) -> Tuple[str,str]:
 
     # --- Specials (meme rules) ---
     forced_bucket, special_react = match_special(title, artists)
-    special_version = detect_special_version_tags(title)
-    kb_entry = find_kb_entry(title, artists)
+    if prefetched is not None:
+        kb_entry, special_version = prefetched
+    else:
+        special_version = detect_special_version_tags(title)
+        kb_entry = find_kb_entry(title, artists)
 
     # Case A: Unknown policy (no KB entry and no forced special rule)
     if not kb_entry and not forced_bucket:
-        rx_cfg = read_json(RX_PATH, {})
+        rx_cfg = get_reactions()
         reaction, genres = _handle_unknown_policy(rx_cfg, special_version, cfg)
         
         # Apply special react override if it exists (though forced_bucket is False here)
@@ -671,10 +1168,14 @@ def compute_reaction(title:str, artists:str) -> Tuple[str,str]:
         return reaction, genres
 
     # Case B: Known Song or Forced Bucket
-    # Load Memory
-    mem = load_mem()
-    ekey = f"{KB._norm(kb_entry.get('title',''))} - {KB._norm(kb_entry.get('artist',''))}" if kb_entry else f"{KB._norm(title)} - {KB._norm(artists)}"
-    ment = mem.get(ekey, {"contexts":{}})
+    # Load Memory (private copy of the entry; the flusher may serialize _MEM meanwhile)
+    if kb_entry:
+        tn, an = KB.norm_keys(kb_entry)
+    else:
+        tn, an = _kb_norm(title), _kb_norm(artists)
+    ekey = f"{tn} - {an}"
+    with _MEM_LOCK:
+        ment = copy.deepcopy(load_mem().get(ekey, {"contexts":{}}))
     apply_decay(ment)
 
     # Determine Tier
@@ -697,14 +1198,16 @@ def compute_reaction(title:str, artists:str) -> Tuple[str,str]:
 
     # Persist Memory
     _update_memory_score(ment, ctx, tier)
-    mem[ekey]=ment
-    save_mem(mem)
+    with _MEM_LOCK:
+        mem = load_mem()
+        mem[ekey]=ment
+        save_mem(mem)
 
     RESULT_CACHE.set(key, (reaction, genres))
     return reaction, genres
 
 # --- Helpers for tick_loop (Refactored for S3776) ---
-def _init_new_song_state(title: str, artists: str, ctx: str, now: float) -> Tuple[float, float, float, dict]:
+def _init_new_song_state(title: str, artists: str, ctx: str, now: float, prefetched: Optional[Tuple[Optional[dict], Optional[str]]] = None) -> Tuple[float, float, float, dict]:
     """Helper: Initializes state when a new song is detected."""
     # Timings
     p_until = now + secrets.SystemRandom().uniform(LISTEN_CFG.get("random_delay", {}).get("min_s", 40),
@@ -712,15 +1215,18 @@ def _init_new_song_state(title: str, artists: str, ctx: str, now: float) -> Tupl
     m_from = now + float(LISTEN_CFG.get("mid_switch_after_s", 50))
     c_until = now + 4.0
 
-    # Write Listening
     listen_text = LISTEN_CFG.get("text", DEFAULT_LISTENING_TEXT)
-    write_reaction(listen_text)
 
-    # Write Genres
-    special = detect_special_version_tags(title)
-    kb_entry = find_kb_entry(title, artists)
+    # Genres
+    if prefetched is not None:
+        kb_entry, special = prefetched
+    else:
+        special = detect_special_version_tags(title)
+        kb_entry = find_kb_entry(title, artists)
     genres_now = _construct_genres_string(kb_entry, special)
-    write_genres(genres_now)
+
+    # Write Listening + Genres
+    write_outputs(listen_text, genres_now)
 
     # Output Dict
     curr_out = {
@@ -738,22 +1244,24 @@ def _process_pending_mode(now: float, mid_from: float, cooldown_until: float, cu
     if now > mid_from and secrets.SystemRandom().random() < 0.25:  # NOSONAR - CSPRNG
         mids = LISTEN_CFG.get("mid_texts", [DEFAULT_LISTENING_TEXT])
         mid = secrets.choice(mids)
-        if time.time() > cooldown_until:
+        if _now() > cooldown_until:
             write_reaction(mid)
-            cooldown_until = time.time() + 1.5
+            cooldown_until = _now() + 1.5
             current_output["reaction"] = mid
     return cooldown_until, current_output
 
-def _process_final_result(title: str, artists: str, ctx: str, last_written: Optional[Tuple], cooldown_until: float, current_output: dict) -> Tuple[Optional[Tuple], float, dict]:
+def _process_final_result(title: str, artists: str, ctx: str, last_written: Optional[Tuple], cooldown_until: float, current_output: dict, prefetched: Optional[Tuple[Optional[dict], Optional[str]]] = None) -> Tuple[Optional[Tuple], float, dict]:
     """Helper: Computes and writes the final reaction."""
-    reaction, genres = compute_reaction(title, artists)
+    if prefetched is not None:
+        reaction, genres = compute_reaction(title, artists, prefetched=prefetched)
+    else:
+        reaction, genres = compute_reaction(title, artists)
     state_tuple = (reaction, genres, title, artists, ctx)
 
     if state_tuple != last_written:
-        if time.time() > cooldown_until:
-            write_reaction(reaction)
-            write_genres(genres)
-            cooldown_until = time.time() + 1.5
+        if _now() > cooldown_until:
+            write_outputs(reaction, genres)
+            cooldown_until = _now() + 1.5
             dbg(f"[final] {title} - {artists} | ctx={ctx} | reaction='{reaction}' | genres='{genres}'")
 
         current_output = {
@@ -766,47 +1274,84 @@ def _process_final_result(title: str, artists: str, ctx: str, last_written: Opti
         
     return last_written, cooldown_until, current_output
 
-def tick_loop():
-    """Main background loop to monitor Spotify and trigger updates."""
-    global pending_until, mid_from, cooldown_until, last_key, last_song_log_ts, last_written, current_output
+def _advance_song_state(title: str, artists: str):
+    """Helper: One tick of the listening state machine (blocking file IO; runs off the event loop)."""
+    global pending_until, mid_from, cooldown_until, last_key, last_song_log_ts, last_written, current_output, prefetched
+    ctx, _ = active_context()
+    key = (title, artists, ctx)
+    now = _now()
+
+    # New song? -> Listening & Genres immediately + log once
+    if key != last_key:
+        last_key = key
+        # KB entry + special tag are reused by the final compute for this song
+        prefetched = (find_kb_entry(title, artists), detect_special_version_tags(title))
+        pending_until, mid_from, cooldown_until, current_output = _init_new_song_state(title, artists, ctx, now, prefetched)
+        last_song_log_ts = now
+    else:
+        # Keep-alive: at most every 20s
+        if now - last_song_log_ts > 20:
+            dbg(f"[song-keepalive] > {title} - {artists} | ctx={ctx} (still pending)")
+            last_song_log_ts = now
+
+    # still pending?
+    if now < pending_until:
+        cooldown_until, current_output = _process_pending_mode(now, mid_from, cooldown_until, current_output)
+        return
+
+    # final compute
+    last_written, cooldown_until, current_output = _process_final_result(title, artists, ctx, last_written, cooldown_until, current_output, prefetched)
+
+def _poll_interval(stable_ticks: int) -> float:
+    """Seconds until the next now-playing poll."""
+    now = _now()
+    if now < pending_until:
+        return float(INTERVAL_S)  # listening phase: keep mid texts and the final reaction on time
+    interval = min(POLL_MAX_S, POLL_SLOW_S * (1 + stable_ticks // POLL_STABLE_STEP))
+    ends_at = _NP_STATE["ends_at"]
+    if ends_at > now:
+        interval = min(interval, ends_at - now + 1.0)  # wake just after the track should change
+    return max(float(INTERVAL_S), interval)
+
+async def tick_loop():
+    """Main background task: polls Spotify without blocking, then advances the song state in a worker thread."""
+    next_tick = _now()
+    last_np, stable_ticks = None, 0
     while True:
         try:
-            title, artists = spotify_nowplaying()
-            if not title and not artists:
-                time.sleep(INTERVAL_S)
-                continue
-
-            ctx, _ = active_context()
-            key = (title, artists, ctx)
-            now = time.time()
-
-            # New song? -> Listening & Genres immediately + log once
-            if key != last_key:
-                last_key = key
-                pending_until, mid_from, cooldown_until, current_output = _init_new_song_state(title, artists, ctx, now)
-                last_song_log_ts = now
-            else:
-                # Keep-alive: at most every 20s
-                if now - last_song_log_ts > 20:
-                    dbg(f"[song-keepalive] > {title} - {artists} | ctx={ctx} (still pending)")
-                    last_song_log_ts = now
-
-            # still pending?
-            if now < pending_until:
-                cooldown_until, current_output = _process_pending_mode(now, mid_from, cooldown_until, current_output)
-                time.sleep(INTERVAL_S)
-                continue
-
-            # final compute
-            last_written, cooldown_until, current_output = _process_final_result(title, artists, ctx, last_written, cooldown_until, current_output)
-
+            title, artists = await spotify_nowplaying()
+            stable_ticks = stable_ticks + 1 if (title, artists) == last_np else 0
+            last_np = (title, artists)
+            if title or artists:
+                await asyncio.to_thread(_advance_song_state, title, artists)
         except Exception as e:
             log(f"[loop] {e}")
-        finally:
-            time.sleep(INTERVAL_S)
+        # Fixed cadence on a monotonic deadline, so request/IO time does not add drift;
+        # after a stall longer than one interval, resync instead of firing a burst of ticks
+        interval = _poll_interval(stable_ticks)
+        next_tick += interval
+        delay = next_tick - _now()
+        if delay < -interval:
+            next_tick = _now()
+        # Single pacing point; cancellation on shutdown lands here at the latest
+        await asyncio.sleep(max(0.0, delay))
 
 # --- FastAPI ---
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Runs the Spotify ticker as a task on the server's event loop."""
+    global HTTP
+    HTTP = _make_http_client()
+    task = asyncio.create_task(tick_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        await HTTP.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def root():
@@ -912,6 +1457,5 @@ def get_song_features(title: str = "", artist: str = ""):
     })
 
 
-# --- Background worker ---
-t = threading.Thread(target=tick_loop, daemon=True)
-t.start()
\ No newline at end of file
+# --- Background worker (the Spotify ticker is started by lifespan) ---
+threading.Thread(target=mem_flush_loop, daemon=True).start()
\ No newline at end of file
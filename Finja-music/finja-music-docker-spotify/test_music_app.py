@@ -30,6 +30,7 @@
 """
 
 import unittest
+import asyncio
 import os
 import sys
 import json
@@ -39,6 +40,8 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 from typing import Any, Optional
 
+import httpx
+
 # =============================================================================
 # Configuration & Setup
 # =============================================================================
@@ -218,6 +221,124 @@ class TestKBIndex(unittest.TestCase):
         self.assertEqual(len(idx.index["by_title_artist"]), 0)
 
 
+class TestKBIndexCache(unittest.TestCase):
+    """
+    Round-trip tests for load_kb_index_with_cache (JSON key cache).
+    """
+
+    ENTRIES = [
+        {"title": "Song One (Radio Edit)", "artist": "Artist A", "tags": ["pop"]},
+        {"title": "Song Two", "artist": "Artist B", "tags": ["rock"],
+         "notes": '{"artist_aliases": ["B Band"]}'},
+    ]
+
+    def setUp(self):
+        if not APP_LOADED:
+            self.skipTest("app.py could not be imported")
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.kb = self.test_dir / "songs_kb.json"
+        self.cache = self.test_dir / "cache" / "kb_index.json"
+        self.kb.write_text(json.dumps(self.ENTRIES), encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _load(self):
+        """Loads through the cache; returns (index, from_cache mock, log mock)."""
+        real = app_module.KBIndex.from_cache
+        with patch.object(app_module.KBIndex, "from_cache", side_effect=real) as spy, \
+             patch.object(app_module, "log") as log:
+            idx = app_module.load_kb_index_with_cache(self.kb, self.cache)
+        return idx, spy, log
+
+    def _read_cache(self):
+        return json.loads(self.cache.read_text(encoding="utf-8"))
+
+    def _assert_same_index(self, idx):
+        fresh = app_module.KBIndex(json.loads(self.kb.read_text(encoding="utf-8")))
+        self.assertEqual(set(idx.by_title), set(fresh.by_title))
+        self.assertEqual(set(idx.by_title_artist), set(fresh.by_title_artist))
+
+    def test_fresh_build_writes_cache(self):
+        """Test: Without a cache the index is built and the cache written."""
+        idx, spy, _ = self._load()
+        spy.assert_not_called()
+        self._assert_same_index(idx)
+        cached = self._read_cache()
+        self.assertEqual(cached["version"], app_module.KB_INDEX_CACHE_VERSION)
+        self.assertEqual(cached["json_fingerprint"]["stat"], app_module._kb_stat(self.kb))
+        self.assertEqual(len(cached["keys"]), len(self.ENTRIES))
+
+    def test_stat_hit_reuses_keys(self):
+        """Test: An unchanged KB (same size/mtime) is served from the cache without rewriting it."""
+        self._load()
+        cache_mtime = self.cache.stat().st_mtime_ns
+        with patch.object(app_module.hashlib, "blake2b") as blake:
+            idx, spy, _ = self._load()
+        spy.assert_called_once()
+        blake.assert_not_called()
+        self.assertEqual(self.cache.stat().st_mtime_ns, cache_mtime)
+        self._assert_same_index(idx)
+        self.assertIn(("song two", "b band"), idx.by_title_artist)
+
+    def test_touched_unchanged_kb_hash_hit(self):
+        """Test: A touched but identical KB reuses the keys and refreshes the stat fingerprint."""
+        self._load()
+        old_fp = self._read_cache()["json_fingerprint"]
+        st = self.kb.stat()
+        os.utime(self.kb, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        idx, spy, _ = self._load()
+        spy.assert_called_once()
+        new_fp = self._read_cache()["json_fingerprint"]
+        self.assertEqual(new_fp["blake2b"], old_fp["blake2b"])
+        self.assertNotEqual(new_fp["stat"], old_fp["stat"])
+        self.assertEqual(new_fp["stat"], app_module._kb_stat(self.kb))
+        self._assert_same_index(idx)
+
+    def test_changed_kb_rebuilds(self):
+        """Test: A changed KB is re-indexed and the cache replaced."""
+        self._load()
+        old_fp = self._read_cache()["json_fingerprint"]
+        self.kb.write_text(json.dumps(self.ENTRIES + [{"title": "Song Three", "artist": "Artist C"}]), encoding="utf-8")
+        idx, spy, _ = self._load()
+        spy.assert_not_called()
+        self.assertIn(("song three", "artist c"), idx.by_title_artist)
+        cached = self._read_cache()
+        self.assertNotEqual(cached["json_fingerprint"]["blake2b"], old_fp["blake2b"])
+        self.assertEqual(len(cached["keys"]), 3)
+
+    def test_old_cache_versions_ignored(self):
+        """Test: v1/v2 caches are ignored and overwritten with the current format."""
+        for version in (1, 2):
+            with self.subTest(version=version):
+                self._load()
+                cached = self._read_cache()
+                cached["version"] = version
+                cached["keys"] = [["bogus", "bogus"]] * len(self.ENTRIES)
+                self.cache.write_text(json.dumps(cached), encoding="utf-8")
+                idx, spy, _ = self._load()
+                spy.assert_not_called()
+                self._assert_same_index(idx)
+                self.assertEqual(self._read_cache()["version"], app_module.KB_INDEX_CACHE_VERSION)
+
+    def test_from_cache_entry_count_mismatch(self):
+        """Test: from_cache rejects keys that don't match the entries; the loader logs it and rebuilds."""
+        entries = [dict(e) for e in self.ENTRIES]
+        with self.assertRaises(ValueError):
+            app_module.KBIndex.from_cache(entries, {"keys": [["song one", "artist a"]]})
+
+        self._load()
+        cached = self._read_cache()
+        cached["keys"] = cached["keys"][:1]
+        self.cache.write_text(json.dumps(cached), encoding="utf-8")
+        idx, spy, log = self._load()
+        spy.assert_called_once()
+        self._assert_same_index(idx)
+        messages = [c.args[0] for c in log.call_args_list]
+        self.assertTrue(any("cached index keys unusable" in m for m in messages), messages)
+        self.assertFalse(any("cache probe failed" in m for m in messages), messages)
+
+
 # =============================================================================
 # Test: Utility Functions
 # =============================================================================
@@ -394,6 +515,74 @@ class TestMemoryFunctions(unittest.TestCase):
         self.assertAlmostEqual(ment["contexts"]["gaming"]["score"], 0.1)
 
 
+class TestMemoryFlush(unittest.TestCase):
+    """
+    Tests for the batched memory writes (save_mem / flush_mem).
+    """
+
+    def setUp(self):
+        if not APP_LOADED:
+            self.skipTest("app.py could not be imported")
+        self.test_dir = tempfile.mkdtemp()
+        self.mem_path = Path(self.test_dir) / "memory.json"
+        self._saved = (app_module._MEM, app_module._MEM_DIRTY, app_module._MEM_PENDING)
+        app_module._MEM, app_module._MEM_DIRTY, app_module._MEM_PENDING = {}, False, 0
+        patchers = [patch.object(app_module, "MEM_PATH", self.mem_path),
+                    patch.object(app_module, "MEM_FLUSH_EVERY_N", 3)]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        app_module._MEM, app_module._MEM_DIRTY, app_module._MEM_PENDING = self._saved
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read(self):
+        return json.loads(self.mem_path.read_text(encoding="utf-8"))
+
+    def test_save_mem_defers_write(self):
+        """Test: save_mem only marks memory dirty below MEM_FLUSH_EVERY_N."""
+        mem = app_module.load_mem()
+        for i in range(2):
+            mem[f"song{i}"] = {"contexts": {}}
+            app_module.save_mem(mem)
+        self.assertFalse(self.mem_path.exists())
+        self.assertTrue(app_module._MEM_DIRTY)
+        self.assertEqual(app_module._MEM_PENDING, 2)
+
+    def test_save_mem_flushes_after_n(self):
+        """Test: The Nth save_mem writes memory.json and resets the counters."""
+        mem = app_module.load_mem()
+        for i in range(3):
+            mem[f"song{i}"] = {"contexts": {}}
+            app_module.save_mem(mem)
+        self.assertEqual(set(self._read()), {"song0", "song1", "song2"})
+        self.assertFalse(app_module._MEM_DIRTY)
+        self.assertEqual(app_module._MEM_PENDING, 0)
+
+        mem["song3"] = {"contexts": {}}
+        app_module.save_mem(mem)
+        self.assertNotIn("song3", self._read())
+        self.assertEqual(app_module._MEM_PENDING, 1)
+
+    def test_flush_mem_writes_pending(self):
+        """Test: flush_mem writes pending changes right away."""
+        mem = app_module.load_mem()
+        mem["song"] = {"contexts": {"gaming": {"score": 1.0, "seen": 1, "last_seen": 0}}}
+        app_module.save_mem(mem)
+        app_module.flush_mem()
+        self.assertEqual(self._read()["song"]["contexts"]["gaming"]["score"], 1.0)
+        self.assertFalse(app_module._MEM_DIRTY)
+        self.assertEqual(app_module._MEM_PENDING, 0)
+
+    def test_flush_mem_noop_when_clean(self):
+        """Test: flush_mem does not write when nothing changed."""
+        with patch.object(app_module, "write_json") as write:
+            app_module.flush_mem()
+        write.assert_not_called()
+        self.assertFalse(self.mem_path.exists())
+
+
 # =============================================================================
 # Test: LRU Cache
 # =============================================================================
@@ -599,11 +788,72 @@ class TestMatchSpecial(unittest.TestCase):
         forced, react = app_module.match_special("Random Song", "Random Artist")
         
         # If no rules defined, both should be None
-        # (Actual result depends on SPECIAL_RULES config)
+        # (Actual result depends on the "special" rules in reactions.json)
         self.assertIsInstance(forced, (str, type(None)))
         self.assertIsInstance(react, (str, type(None)))
 
 
+class TestReactionsReload(unittest.TestCase):
+    """
+    Tests that an edited reactions.json reaches thresholds and special rules too.
+    """
+
+    RX = {
+        "thresholds": {"love": 9, "like": 3, "dislike": -3, "hate": -9},
+        "special": [{"title_contains": ["nightcore"], "force_bucket": "love", "react": "Nightcore!"}],
+    }
+
+    def setUp(self):
+        if not APP_LOADED:
+            self.skipTest("app.py could not be imported")
+        self.test_dir = tempfile.mkdtemp()
+        self.rx_path = Path(self.test_dir) / "reactions.json"
+        self._saved = (app_module.REACTIONS, app_module._RX_MTIME, app_module._RX_CHECKED_AT)
+
+    def tearDown(self):
+        app_module.REACTIONS, app_module._RX_MTIME, app_module._RX_CHECKED_AT = self._saved
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_and_reload(self, rx: dict):
+        self.rx_path.write_text(json.dumps(rx), encoding="utf-8")
+        app_module._RX_MTIME = None
+        app_module._RX_CHECKED_AT = float("-inf")
+        with patch.object(app_module, "RX_PATH", self.rx_path):
+            return app_module.get_reactions()
+
+    def test_thresholds_follow_reload(self):
+        """Test: Edited thresholds apply without a restart."""
+        self._write_and_reload(self.RX)
+        self.assertEqual(app_module.tier_from_score(5.0), "like")
+        self.assertEqual(app_module.thresholds(), (9.0, 3.0, -3.0, -9.0))
+
+        self._write_and_reload(dict(self.RX, thresholds={"love": 4, "like": 2, "dislike": -1, "hate": -2}))
+        self.assertEqual(app_module.tier_from_score(5.0), "love")
+        self.assertEqual(app_module.tier_from_score(-1.5), "dislike")
+        self.assertEqual(app_module.T_LOVE, 4.0)
+
+    def test_special_rules_follow_reload(self):
+        """Test: Edited special rules apply without a restart."""
+        self._write_and_reload(self.RX)
+        self.assertEqual(app_module.match_special("Song (Nightcore)", "Someone"), ("love", "Nightcore!"))
+        self.assertEqual(app_module.match_special("Song (Sped Up)", "Someone"), (None, None))
+
+        self._write_and_reload(dict(self.RX, special=[
+            {"title_contains": ["sped up"], "force_bucket": "dislike", "react": "Too fast"},
+        ]))
+        self.assertEqual(app_module.match_special("Song (Sped Up)", "Someone"), ("dislike", "Too fast"))
+        self.assertEqual(app_module.match_special("Song (Nightcore)", "Someone"), (None, None))
+
+    def test_tables_not_rebuilt_without_change(self):
+        """Test: Thresholds and special tables are reused while REACTIONS is unchanged."""
+        self._write_and_reload(self.RX)
+        tables = app_module.special_tables()
+        with patch.object(app_module, "_preprocess_special_rules") as pre:
+            self.assertIs(app_module.special_tables(), tables)
+            app_module.match_special("Song", "Artist")
+        pre.assert_not_called()
+
+
 # =============================================================================
 # Test: Helper Functions for Tick Loop
 # =============================================================================
@@ -625,7 +875,7 @@ class TestTickLoopHelpers(unittest.TestCase):
         mock_kb.return_value = None
         
         import time
-        now = time.time()
+        now = time.monotonic()
         
         p_until, m_from, c_until, output = app_module._init_new_song_state(
             "Test Title", "Test Artist", "gaming", now
@@ -664,6 +914,179 @@ class TestTickLoopHelpers(unittest.TestCase):
         self.assertEqual(output["reaction"], "Great song!")
         self.assertEqual(output["genres"], "Pop, Rock")
 
+    def test_poll_interval_table(self):
+        """Test: _poll_interval honours pending_until and the expected track end."""
+        now = 1000.0
+        cases = [
+            # (pending_until, ends_at, stable_ticks, expected)
+            (1010.0, 0.0, 0, 5.0),      # reaction pending -> fast poll
+            (1010.0, 1003.0, 7, 5.0),   # pending wins over track end and stable ticks
+            (0.0, 0.0, 0, 30.0),        # idle, end unknown -> POLL_SLOW_S
+            (0.0, 0.0, 5, 60.0),        # same track for a while -> grows
+            (0.0, 0.0, 50, 60.0),       # ... capped at POLL_MAX_S
+            (999.0, 0.0, 0, 30.0),      # pending already expired
+            (0.0, 1010.0, 0, 11.0),     # wake just after the track ends
+            (0.0, 1001.0, 0, 5.0),      # ... never faster than INTERVAL_S
+            (0.0, 990.0, 0, 30.0),      # track end in the past is ignored
+            (0.0, 2000.0, 10, 60.0),    # track end far away -> normal back-off
+        ]
+        with patch.object(app_module, "_now", return_value=now), \
+             patch.object(app_module, "INTERVAL_S", 5), \
+             patch.object(app_module, "POLL_SLOW_S", 30.0), \
+             patch.object(app_module, "POLL_MAX_S", 60.0), \
+             patch.dict(app_module._NP_STATE):
+            for pending_until, ends_at, stable_ticks, expected in cases:
+                with self.subTest(pending_until=pending_until, ends_at=ends_at, stable_ticks=stable_ticks), \
+                     patch.object(app_module, "pending_until", pending_until):
+                    app_module._NP_STATE["ends_at"] = ends_at
+                    self.assertEqual(app_module._poll_interval(stable_ticks), expected)
+
+
+class TestSpotifyPoller(unittest.TestCase):
+    """
+    Tests for the async Spotify poller (httpx.MockTransport, no network).
+    """
+
+    NP_URL = "https://api.spotify.com/v1/me/player/currently-playing"
+
+    def setUp(self):
+        if not APP_LOADED:
+            self.skipTest("app.py could not be imported")
+        self._saved = (app_module.HTTP, app_module.ACCESS_TOKEN, app_module.ACCESS_TOKEN_TS, dict(app_module._NP_STATE))
+        app_module.ACCESS_TOKEN = "token"
+        app_module.ACCESS_TOKEN_TS = app_module._now()
+        app_module._NP_STATE.update(etag=None, result=("", ""), backoff_until=0.0, ends_at=0.0)
+        self.requests = []
+
+    def tearDown(self):
+        app_module.HTTP, app_module.ACCESS_TOKEN, app_module.ACCESS_TOKEN_TS, np_state = self._saved
+        app_module._NP_STATE.clear()
+        app_module._NP_STATE.update(np_state)
+
+    def _poll(self, responses, calls=1):
+        """Runs spotify_nowplaying `calls` times against canned responses; returns the results."""
+        responses = list(responses)
+
+        def handler(request):
+            self.requests.append(request)
+            return responses.pop(0)
+
+        async def main():
+            app_module.HTTP = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return [await app_module.spotify_nowplaying() for _ in range(calls)]
+            finally:
+                await app_module.HTTP.aclose()
+
+        return asyncio.run(main())
+
+    @staticmethod
+    def _playing(title="Song", artists=("A", "B"), etag='"v1"', progress_ms=60_000, duration_ms=180_000):
+        body = {
+            "is_playing": True, "progress_ms": progress_ms,
+            "item": {"name": title, "duration_ms": duration_ms, "artists": [{"name": a} for a in artists]},
+        }
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+    def test_nowplaying_200_playing(self):
+        """Test: 200 with is_playing returns title/artists and records ETag + track end."""
+        before = app_module._now()
+        result = self._poll([self._playing()])
+        self.assertEqual(result, [("Song", "A, B")])
+        self.assertEqual(str(self.requests[0].url), self.NP_URL)
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer token")
+        self.assertEqual(app_module._NP_STATE["etag"], '"v1"')
+        self.assertGreaterEqual(app_module._NP_STATE["ends_at"], before + 120)
+
+    def test_nowplaying_204_nothing_playing(self):
+        """Test: 204 returns empty title/artists."""
+        result = self._poll([httpx.Response(204)])
+        self.assertEqual(result, [("", "")])
+        self.assertEqual(app_module._NP_STATE["ends_at"], 0.0)
+
+    def test_nowplaying_304_reuses_result(self):
+        """Test: 304 reuses the cached result and sends the stored ETag."""
+        result = self._poll([self._playing(), httpx.Response(304)], calls=2)
+        self.assertEqual(result, [("Song", "A, B"), ("Song", "A, B")])
+        self.assertNotIn("If-None-Match", self.requests[0].headers)
+        self.assertEqual(self.requests[1].headers["If-None-Match"], '"v1"')
+
+    def test_nowplaying_429_backoff_window(self):
+        """Test: 429 keeps the last song and skips requests until Retry-After passes."""
+        app_module._NP_STATE["result"] = ("Old", "Artist")
+        t = [1000.0]
+        with patch.object(app_module, "_now", lambda: t[0]):
+            app_module.ACCESS_TOKEN_TS = t[0]
+            result = self._poll([httpx.Response(429, headers={"Retry-After": "20"})], calls=2)
+            self.assertEqual(result, [("Old", "Artist"), ("Old", "Artist")])
+            self.assertEqual(len(self.requests), 1)
+            self.assertEqual(app_module._NP_STATE["backoff_until"], 1020.0)
+            t[0] = 1021.0
+            self.assertEqual(self._poll([self._playing()]), [("Song", "A, B")])
+        self.assertEqual(len(self.requests), 2)
+
+    def test_nowplaying_429_retry_after_capped(self):
+        """Test: A huge or invalid Retry-After is clamped."""
+        t = [1000.0]
+        with patch.object(app_module, "_now", lambda: t[0]):
+            app_module.ACCESS_TOKEN_TS = t[0]
+            self._poll([httpx.Response(429, headers={"Retry-After": "86400"})])
+            self.assertEqual(app_module._NP_STATE["backoff_until"], 1000.0 + app_module.POLL_MAX_S * 10)
+            app_module._NP_STATE["backoff_until"] = 0.0
+            self._poll([httpx.Response(429, headers={"Retry-After": "soon"})])
+            self.assertEqual(app_module._NP_STATE["backoff_until"], 1000.0 + app_module.INTERVAL_S)
+
+    def test_nowplaying_204_resets_etag(self):
+        """Test: 204 drops the ETag so the next poll is unconditional."""
+        result = self._poll([self._playing(), httpx.Response(204), self._playing(title="Next")], calls=3)
+        self.assertEqual(result, [("Song", "A, B"), ("", ""), ("Next", "A, B")])
+        self.assertEqual(self.requests[1].headers["If-None-Match"], '"v1"')
+        self.assertNotIn("If-None-Match", self.requests[2].headers)
+
+    def test_token_refresh_failure(self):
+        """Test: A failed token refresh raises and never calls the player endpoint."""
+        app_module.ACCESS_TOKEN = ""
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._poll([httpx.Response(400, json={"error": "invalid_grant"})])
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].url.host, "accounts.spotify.com")
+        self.assertEqual(app_module.ACCESS_TOKEN, "")
+
+    def test_token_refresh_then_poll(self):
+        """Test: A missing token is refreshed before polling."""
+        app_module.ACCESS_TOKEN = ""
+        result = self._poll([httpx.Response(200, json={"access_token": "fresh"}), self._playing()])
+        self.assertEqual(result, [("Song", "A, B")])
+        self.assertEqual(self.requests[1].headers["Authorization"], "Bearer fresh")
+
+    def test_lifespan_cancels_task_and_closes_client(self):
+        """Test: lifespan starts tick_loop, then cancels it and closes HTTP on shutdown."""
+        state = {"started": False, "cancelled": False}
+
+        async def fake_tick_loop():
+            state["started"] = True
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(204)))
+
+        async def main():
+            async with app_module.lifespan(app_module.app):
+                await asyncio.sleep(0)
+                self.assertIs(app_module.HTTP, client)
+                self.assertFalse(client.is_closed)
+
+        with patch.object(app_module, "tick_loop", fake_tick_loop), \
+             patch.object(app_module, "_make_http_client", return_value=client):
+            asyncio.run(main())
+
+        self.assertTrue(state["started"])
+        self.assertTrue(state["cancelled"])
+        self.assertTrue(client.is_closed)
+
 
 # =============================================================================
 # Main Entry Point
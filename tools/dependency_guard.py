@@ -100,6 +100,9 @@ IMPORT_TO_DIST: Dict[str, str] = {
     "boto3": "boto3",
     "botocore": "botocore",
     "gi": "PyGObject",
+    "orjson": "orjson",
+    "ahocorasick": "pyahocorasick",
+    "brotli": "Brotli",
     "cv2": "opencv-python",
 }
 
@@ -135,6 +138,9 @@ DYNAMIC_OPTIONAL: Set[str] = {
     "sentence_transformers",  # OpenWebUI host function, not Memory server image
     "sklearn",
     "pyautogui",  # jank local controller, not container API path
+    "orjson",  # try/except speedup; stdlib json fallback
+    "ahocorasick",  # try/except speedup; substring-scan fallback
+    "brotli",  # optional .br panel assets; gzip fallback
 }
 
 # Filenames whose third-party imports are host/plugin/jank-only (not the module image)